@@ -0,0 +1,10 @@
+"""
+Filesystem anchors shared by the pdf_to_wallet modules and scripts.
+"""
+
+import os
+from pathlib import Path
+
+# wallet-web-app/, four levels above this directory; holds the .env file
+PROJECT_ROOT = Path(os.path.abspath(__file__)).parents[4]
+ENV_PATH = PROJECT_ROOT / '.env'
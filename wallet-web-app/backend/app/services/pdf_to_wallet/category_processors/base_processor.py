@@ -2,24 +2,102 @@
 Base processor class for all category-specific processors.
 """
 
-import uuid
 import logging
-from typing import Dict, List, Any, Optional
+import secrets
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import Callable, Dict, List, Any, Optional, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
+# Pass-wide constants shared by every processor
+BACKGROUND_COLOR = "rgb(0, 0, 0)"
+FOREGROUND_COLOR = "rgb(255, 255, 255)"
+LABEL_COLOR = "rgb(255, 255, 255)"
+BARCODE_FORMAT = "PKBarcodeFormatQR"
+BARCODE_ENCODING = "utf-8"
+
+_MONTHS = (
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+)
+
+
+def _format_time(dt: datetime) -> str:
+    """dt formatted as "%I:%M %p"."""
+    return f"{(dt.hour - 1) % 12 + 1:02d}:{dt.minute:02d} {'PM' if dt.hour >= 12 else 'AM'}"
+
+
+def _format_date_time(dt: datetime) -> str:
+    """dt formatted as "%B %d, %Y at %I:%M %p"."""
+    return f"{_MONTHS[dt.month - 1]} {dt.day:02d}, {dt.year} at {_format_time(dt)}"
+
+
+# Display formats the processors use, rendered without strftime (and its locale lookups)
+_FAST_FORMATS = {
+    "%B %d, %Y at %I:%M %p": _format_date_time,
+    "%I:%M %p": _format_time,
+}
+
+
+@lru_cache(maxsize=1024)
+def parse_and_format_datetime(datetime_str: str, fmt: str) -> Tuple[str, str]:
+    """Parse an ISO 8601 datetime and return (isoformat, value formatted with fmt).
+    
+    Tickets from one document usually share a datetime, so results are cached.
+    Raises ValueError for unparseable strings.
+    """
+    dt = datetime.fromisoformat(datetime_str[:-1] + '+00:00' if datetime_str.endswith('Z') else datetime_str)
+    formatter = _FAST_FORMATS.get(fmt)
+    return dt.isoformat(), formatter(dt) if formatter else dt.strftime(fmt)
+
+
+# A field value is either a plain ticket key or a getter over the ticket
+FieldSource = Union[str, Callable[[Dict[str, Any]], Any]]
+
+
+@dataclass(frozen=True)
+class PassSpec:
+    """Declarative layout of a pass type, built by CategoryProcessor._build_one."""
+    pass_type: str                  # Wallet pass style key, e.g. 'eventTicket'
+    name: str                       # Used in log messages
+    default_title: str
+    title_field: Tuple[str, str]    # (key, label) of the leading primary field
+    # (key, label, strftime format, dateStyle, timeStyle) of the primary datetime field
+    datetime_field: Optional[Tuple[str, str, str, str, str]] = None
+    # (section, ((key, label, source), ...)) in pass order
+    sections: Tuple[Tuple[str, Tuple[Tuple[str, str, FieldSource], ...]], ...] = ()
+
 
 class CategoryProcessor:
     """Base class for category-specific processors."""
     
+    # Layout used by the default _build_one; processors with custom logic override _build_one
+    PASS_SPEC: Optional[PassSpec] = None
+    
     def __init__(self, organization: str, pass_type_id: str, team_id: str):
         self.organization = organization
         self.pass_type_id = pass_type_id
         self.team_id = team_id
+        # Constant part of every pass; description and serialNumber are placeholders
+        # here so copies keep the original key order
+        # TODO:: colors should be set by the llm response 
+        self._base_template = {
+            "formatVersion": 1,
+            "passTypeIdentifier": pass_type_id,
+            "teamIdentifier": team_id,
+            "organizationName": organization,
+            "description": None,
+            "serialNumber": None,
+            "backgroundColor": BACKGROUND_COLOR,
+            "foregroundColor": FOREGROUND_COLOR,
+            "labelColor": LABEL_COLOR,
+        }
     
     def generate_serial_number(self, ticket_data: Dict[str, Any]) -> str:
         """Generate a unique serial number for the pass."""
-        # Use ticket ID if available, otherwise generate UUID
+        # Use ticket ID if available, otherwise a random suffix
         ticket_id = ticket_data.get('ticket_id')
         order_id = ticket_data.get('order_id')
         
@@ -28,24 +106,53 @@ class CategoryProcessor:
         elif order_id:
             return f"ORDER_{order_id}"
         else:
-            return f"PASS_{uuid.uuid4().hex[:8].upper()}"
+            return f"PASS_{secrets.token_hex(4)}"
     
     def create_base_pass_structure(self, ticket_data: Dict[str, Any], 
                                   description: str, pass_type: str) -> Dict[str, Any]:
         """Create the base Apple Wallet pass structure."""
-        # TODO:: colors should be set by the llm response 
-        return {
-            "formatVersion": 1,
-            "passTypeIdentifier": self.pass_type_id,
-            "teamIdentifier": self.team_id,
-            "organizationName": self.organization,
-            "description": description,
-            "serialNumber": self.generate_serial_number(ticket_data),
-            "backgroundColor": "rgb(0, 0, 0)",
-            "foregroundColor": "rgb(255, 255, 255)",
-            "labelColor": "rgb(255, 255, 255)",
-            f"{pass_type}": {}
-        }
+        pass_data = self._base_template.copy()
+        pass_data["description"] = description
+        pass_data["serialNumber"] = self.generate_serial_number(ticket_data)
+        pass_data[pass_type] = {}
+        return pass_data
+    
+    @staticmethod
+    def _field(key: str, label: str, value: Any) -> Optional[Dict[str, Any]]:
+        """Build a pass field, or None when the value is empty."""
+        return {"key": key, "label": label, "value": value} if value else None
+    
+    @staticmethod
+    def _set_fields(container: Dict[str, Any], section: str, fields) -> None:
+        """Store the non-empty fields under section, omitting the key entirely when none remain."""
+        fields = [f for f in fields if f]
+        if fields:
+            container[section] = fields
+    
+    @staticmethod
+    def _venue(ticket_data: Dict[str, Any]) -> Optional[str]:
+        """Normalized venue, falling back to the raw one."""
+        return ticket_data.get('normalized_venue') or ticket_data.get('raw_venue')
+    
+    @staticmethod
+    def _price_value(ticket_data: Dict[str, Any]) -> Optional[str]:
+        """Format the ticket price as "<amount> <currency>" if an amount is present."""
+        price_data = ticket_data.get('price') or {}
+        amount = price_data.get('amount')
+        if not amount:
+            return None
+        currency = price_data.get('currency')
+        return f"{amount} {currency}" if currency else f"{amount}"
+    
+    @staticmethod
+    def _barcodes(message: str) -> List[Dict[str, Any]]:
+        """Build the barcodes list holding a single QR code for message."""
+        return [{
+            "format": BARCODE_FORMAT,
+            "message": message,
+            "messageEncoding": BARCODE_ENCODING,
+            "altText": message
+        }]
     
     def create_barcode_structure(self, ticket_data: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
         """Create barcode structure if barcode message exists."""
@@ -55,10 +162,49 @@ class CategoryProcessor:
             barcode_message = ticket_data.get('ticket_id') or ticket_data.get('order_id')
         
         if barcode_message:
-            return [{
-                "format": "PKBarcodeFormatQR",
-                "message": str(barcode_message),
-                "messageEncoding": "utf-8",
-                "altText": str(barcode_message)
-            }]
-        return None
\ No newline at end of file
+            return self._barcodes(barcode_message)
+        return None
+    
+    def _build_one(self, ticket: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the pass for a single ticket from the class PASS_SPEC."""
+        spec = self.PASS_SPEC
+        title = ticket.get('normalized_title') or ticket.get('raw_title') or spec.default_title
+        pass_data = self.create_base_pass_structure(ticket, title, spec.pass_type)
+        body = pass_data[spec.pass_type]
+        
+        # Primary fields: title, then date and time
+        primary_fields = [self._field(*spec.title_field, title)]
+        relevant_date = None
+        datetime_str = ticket.get('normalized_datetime') if spec.datetime_field else None
+        if datetime_str:
+            key, label, fmt, date_style, time_style = spec.datetime_field
+            try:
+                relevant_date, display_value = parse_and_format_datetime(datetime_str, fmt)
+            except ValueError:
+                primary_fields.append(self._field(key, label, datetime_str))
+            else:
+                primary_fields.append({
+                    "key": key,
+                    "label": label,
+                    "value": display_value,
+                    "dateStyle": date_style,
+                    "timeStyle": time_style
+                })
+        self._set_fields(body, 'primaryFields', primary_fields)
+        
+        for section, fields in spec.sections:
+            self._set_fields(body, section, [
+                self._field(key, label, source(ticket) if callable(source) else ticket.get(source))
+                for key, label, source in fields
+            ])
+        
+        barcodes = self.create_barcode_structure(ticket)
+        if barcodes:
+            pass_data['barcodes'] = barcodes
+        
+        # Add relevant date for sorting/organization
+        if relevant_date:
+            pass_data['relevantDate'] = relevant_date
+        
+        logger.debug("Created %s pass for: %s", spec.name, title)
+        return pass_data
@@ -0,0 +1,114 @@
+"""
+pytest configuration for the pdf_to_wallet test scripts.
+
+Puts this directory on sys.path and loads the project .env once per
+session, so the individual test modules don't have to, and shares a
+single WalletPassProcessor between tests.
+
+The fake_openai fixture replaces the OpenAI API with a local keep-alive
+HTTP server, so the client's pooled connections behave as they do
+against the real API.
+"""
+
+import itertools
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import fitz
+import pytest
+
+PDF_TO_WALLET_DIR = Path(__file__).parent
+
+if str(PDF_TO_WALLET_DIR) not in sys.path:
+    sys.path.insert(0, str(PDF_TO_WALLET_DIR))
+
+from _paths import ENV_PATH
+from utils import load_env_once
+
+if ENV_PATH.exists():
+    load_env_once(str(ENV_PATH))
+
+
+@pytest.fixture(scope="session")
+def processor():
+    """One WalletPassProcessor for the whole session."""
+    from processor import WalletPassProcessor
+    return WalletPassProcessor()
+
+
+# Minimal extraction that passes VISION_SCHEMA
+EXTRACTION = {
+    "category": "Generic",
+    "category_confidence": 0.9,
+    "tickets_found": 1,
+    "tickets": [{"raw_title": "Test Ticket", "normalized_title": "Test Ticket"}]
+}
+
+
+class _ChatCompletionsHandler(BaseHTTPRequestHandler):
+    """Answers chat completions with EXTRACTION (one per PDF for batches), keeping the connection open."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.requests.append(request)
+        if request["response_format"]["json_schema"]["name"] == "wallet_extraction_batch":
+            markers = sum(
+                part["type"] == "text" and part["text"].startswith("=== PDF ")
+                for part in request["messages"][-1]["content"]
+            )
+            content = {"pdfs": [EXTRACTION] * markers}
+        else:
+            content = EXTRACTION
+        body = json.dumps({
+            "id": f"chatcmpl-{len(self.server.requests)}",
+            "object": "chat.completion",
+            "created": 0,
+            "model": request["model"],
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": json.dumps(content)},
+                "finish_reason": "stop"
+            }],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2}
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    """Point the OpenAI client at a local server; its ``requests`` list holds the request bodies."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ChatCompletionsHandler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setenv("OPENAI_BASE_URL", f"http://127.0.0.1:{server.server_port}/v1")
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def make_pdf(tmp_path):
+    """Factory writing a one-page PDF with the given text; returns its path."""
+    names = itertools.count()
+
+    def make(text):
+        path = tmp_path / f"{next(names)}.pdf"
+        with fitz.open() as doc:
+            doc.new_page().insert_text((72, 72), text)
+            doc.save(str(path))
+        return str(path)
+    return make
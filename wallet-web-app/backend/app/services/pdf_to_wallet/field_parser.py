@@ -8,8 +8,205 @@ import hashlib
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 
+# Single-pass keyword matching when available
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
 logger = logging.getLogger(__name__)
 
+_HEBREW_RE = re.compile(r'[\u0590-\u05FF]')
+
+# Date patterns (various formats including Hebrew)
+_DATE_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'\b\d{1,2}[/.-]\d{1,2}[/.-]\d{2,4}\b',  # DD/MM/YYYY or MM/DD/YYYY
+    r'\b\d{4}[/.-]\d{1,2}[/.-]\d{1,2}\b',    # YYYY-MM-DD
+    r'\b\d{1,2}\s+(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{2,4}\b',
+    r'\b(Mon|Tue|Wed|Thu|Fri|Sat|Sun)[a-z]*\s+\d{1,2}[/.-]\d{1,2}[/.-]\d{2,4}\b',
+    # Hebrew date patterns
+    r'\b\d{1,2}\s+(ינואר|פברואר|מרץ|אפריל|מאי|יוני|יולי|אוגוסט|ספטמבר|אוקטובר|נובמבר|דצמבר)\s+\d{2,4}\b',
+    r'\b(יום ראשון|יום שני|יום שלישי|יום רביעי|יום חמישי|יום שישי|יום שבת)\s+\d{1,2}[/.-]\d{1,2}[/.-]\d{2,4}\b',
+    r'תאריך[:]\s*\d{1,2}[/.-]\d{1,2}[/.-]\d{2,4}',  # Hebrew "date:"
+))
+
+# Time patterns
+_TIME_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'\b\d{1,2}:\d{2}(?::\d{2})?\s*(?:[AP]M)?\b',
+    r'\b\d{1,2}\.\d{2}\b',  # European time format
+))
+
+# Number patterns (potential seat numbers, amounts, etc.)
+_NUMBER_PATTERNS = tuple(re.compile(p) for p in (
+    r'\b\d{3,}\b',  # 3+ digit numbers
+    r'\$\d+(?:\.\d{2})?\b',  # Currency amounts
+    r'\b\d+[A-Z]\b',  # Seat numbers like 12A
+    r'\b[A-Z]\d+\b',   # Gate numbers like A12
+))
+
+# Code patterns (booking refs, PNRs, etc.)
+_CODE_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'\b[A-Z0-9]{6,}\b',  # General alphanumeric codes
+    r'\b[A-Z]{2}\d{3,4}\b',  # Flight numbers
+    r'\bPNR:?\s*([A-Z0-9]+)\b',  # PNR codes
+    r'\bRef:?\s*([A-Z0-9]+)\b',  # Reference codes
+    r'\bBooking:?\s*([A-Z0-9]+)\b',  # Booking codes
+))
+
+# Venue/location patterns (English + Hebrew)
+_VENUE_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'(?:venue|location|theatre|theater|cinema|auditorium)[:]\s*([^\n\r]+)',
+    r'(?:at|@)\s+([A-Z][^,\n\r]{10,50})',
+    # Hebrew venue patterns (enhanced)
+    r'(?:מקום|אולם|בית קולנוע|תיאטרון|אודיטוריום|מרכז|היכל)[:]\s*([^\n\r]+)',
+    r'(?:ב|אצל)[\u0590-\u05FF\s]{2,}',  # Hebrew "at" + Hebrew text
+    r'[:]\s*קולנוע\s*([^\n\r]*)',  # ": קולנוע" pattern
+    r'קולנוע\s+([\u0590-\u05FF\s\w]+)',  # "קולנוע" + venue name
+    r'([\u0590-\u05FF\s]+)\s+קולנוע',  # venue name + "קולנוע"
+))
+
+# Seat patterns (English + Hebrew)
+# Based on debug output, seat numbers appear as single digits (8, 9, 10) on separate lines
+_SEAT_PATTERNS = tuple(re.compile(p, re.IGNORECASE | re.MULTILINE) for p in (
+    r'(?:seat|row|section)[:]\s*([A-Z0-9\-\s]+)',
+    r'\b(?:Row|R)\s*(\d+)\s*(?:Seat|S)\s*([A-Z0-9]+)\b',
+    r'\b(\d+[A-Z])\b',  # Simple seat like 12A
+    # Hebrew seat patterns (enhanced)
+    r'(?:מושב|שורה|מקום|כיסא)[:]\s*([א-ת0-9\-\s]+)',
+    r'(?:שורה|ש)\s*(\d+)\s*(?:מושב|מ)\s*([א-ת0-9]+)',
+    r'מקום\s*(\d+)',  # Hebrew "seat" + number
+    r'^\s*(\d{1,2})\s*$',  # Single/double digit numbers on their own line (seat numbers)
+))
+
+# Auditorium patterns (English + Hebrew)
+_AUDITORIUM_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'(?:auditorium|hall|screen|room)[:]\s*([A-Z0-9\-\s]+)',
+    r'(?:אולם|מסך|חדר)[:]\s*([א-ת0-9\-\s]+)',
+    r'(\d+)\s+אולם',  # number + "אולם"
+    r'אולם\s+(\d+)',  # "אולם" + number
+))
+
+# Movie title patterns (look for specific patterns in Hebrew tickets)
+# From the debug output, we can see the movie title "פורמולה1" appears consistently
+_TITLE_PATTERNS = tuple(re.compile(p, re.MULTILINE) for p in (
+    r'\s([\u0590-\u05FF]+\d+)\s',  # Hebrew text with numbers (like פורמולה1)
+    r'^\s*([\u0590-\u05FF]+\d+)$',  # Hebrew text with numbers on its own line
+    r'([A-Z][a-zA-Z0-9\s]{3,30})',  # English movie titles
+))
+
+# Name patterns (English + Hebrew)
+_NAME_PATTERNS = tuple(re.compile(p) for p in (
+    r'(?:passenger|guest|name)[:]\s*([A-Z][a-z]+\s+[A-Z][a-z]+)',
+    r'\b([A-Z][a-z]+\s+[A-Z][a-z]+)\b',  # Simple first last name
+    # Hebrew name patterns
+    r'(?:נוסע|אורח|שם)[:]\s*([\u0590-\u05FF\s]+)',
+    r'(?:שם מלא|שם הנוסע)[:]\s*([\u0590-\u05FF\s]+)',
+))
+
+# Flight-specific patterns
+_FLIGHT_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'(?:flight|flt)[:]\s*([A-Z]{2}\d{3,4})',
+    r'\b([A-Z]{2}\s*\d{3,4})\b',
+))
+
+# Airport codes
+_AIRPORT_RE = re.compile(r'\b([A-Z]{3})\s*(?:to|→|-)\s*([A-Z]{3})\b')
+
+# PNR pattern
+_PNR_RE = re.compile(r'(?:PNR|Confirmation)[:]\s*([A-Z0-9]{6,})', re.IGNORECASE)
+
+# Reservation/booking patterns (English + Hebrew)
+_RESERVATION_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'(?:booking|reservation|order|confirmation)[:]\s*([A-Z0-9]+)',
+    r'(?:ref|reference)[:]\s*([A-Z0-9]+)',
+    # Hebrew reservation patterns
+    r'(?:הזמנה|רזרבציה|אישור|הזמנת כרטיס)[:]\s*([A-Z0-9]+)',
+    r'(?:מספר הזמנה|קוד הזמנה|מספר אישור)[:]\s*([A-Z0-9]+)',
+))
+
+# Date and time pieces for Hebrew tickets, where they may sit on separate lines
+_DMY_RE = re.compile(r'(\d{2})/(\d{2})/(\d{4})')
+_HM_RE = re.compile(r'(\d{1,2}):(\d{2})')
+
+# Common date patterns and their formats
+_DATETIME_PATTERNS = (
+    (re.compile(r'\b(\d{1,2})[/.-](\d{1,2})[/.-](\d{4})\s+(\d{1,2}):(\d{2})'), '%d/%m/%Y %H:%M'),
+    (re.compile(r'\b(\d{4})[/.-](\d{1,2})[/.-](\d{1,2})\s+(\d{1,2}):(\d{2})'), '%Y-%m-%d %H:%M'),
+    (re.compile(r'\b(\d{1,2})[/.-](\d{1,2})[/.-](\d{2})\s+(\d{1,2}):(\d{2})'), '%d/%m/%y %H:%M'),
+    # Hebrew datetime patterns (date and time might be on separate lines)
+    (_DMY_RE, '%d/%m/%Y'),  # Just date
+    (_HM_RE, '%H:%M'),  # Just time
+)
+
+
+# Pass type indicators, in tie-break order (English + Hebrew)
+_PASS_TYPE_KEYWORDS = {
+    # Boarding pass indicators (English + Hebrew)
+    'boardingPass': (
+        'flight', 'boarding', 'gate', 'terminal', 'pnr', 'airline',
+        'departure', 'arrival', 'aircraft', 'seat assignment',
+        # Hebrew boarding pass keywords
+        'טיסה', 'עלייה למטוס', 'שער', 'טרמינל', 'חברת תעופה',
+        'המראה', 'נחיתה', 'מטוס', 'הקצאת מושב', 'כרטיס טיסה'
+    ),
+
+    # Event ticket indicators (English + Hebrew)
+    'eventTicket': (
+        'seat', 'row', 'auditorium', 'screen', 'section', 'event',
+        'ticket', 'venue', 'show', 'concert', 'theater', 'cinema',
+        # Hebrew event keywords (expanded for better detection)
+        'מושב', 'שורה', 'אולם', 'מסך', 'קטע', 'אירוע',
+        'כרטיס', 'מקום', 'הופעה', 'קונצרט', 'תיאטרון', 'בית קולנוע',
+        'קולנוע', 'סרט', 'הקרנה', 'כרטיס קולנוע', 'הצגה',
+        'כרטיסים', 'מושבים', 'כיסא', 'כיסאות', 'מקומות'
+    ),
+
+    # Coupon indicators (English + Hebrew)
+    'coupon': (
+        'coupon', 'discount', 'promo', 'offer', 'deal', 'save',
+        'percent off', '% off', 'expires',
+        # Hebrew coupon keywords
+        'קופון', 'הנחה', 'פרומו', 'הצעה', 'עסקה', 'חיסכון',
+        'אחוז הנחה', 'פג תוקף', 'בתוקף עד'
+    ),
+
+    # Store card indicators (English + Hebrew)
+    'storeCard': (
+        'loyalty', 'member', 'points', 'balance', 'club', 'rewards',
+        'card number', 'member since',
+        # Hebrew store card keywords
+        'נאמנות', 'חבר', 'נקודות', 'יתרה', 'מועדון', 'תגמולים',
+        'מספר כרטיס', 'חבר מאז', 'כרטיס חבר'
+    ),
+}
+
+if HAS_AHOCORASICK:
+    # One automaton over every keyword; each hit maps back to its pass types
+    _KEYWORD_TYPES: Dict[str, List[str]] = {}
+    for _pass_type, _keywords in _PASS_TYPE_KEYWORDS.items():
+        for _keyword in _keywords:
+            _KEYWORD_TYPES.setdefault(_keyword, []).append(_pass_type)
+    _KEYWORD_AUTOMATON = ahocorasick.Automaton()
+    for _keyword in _KEYWORD_TYPES:
+        _KEYWORD_AUTOMATON.add_word(_keyword, _keyword)
+    _KEYWORD_AUTOMATON.make_automaton()
+    del _pass_type, _keywords, _keyword
+
+
+def _score_pass_types(content: str) -> Dict[str, int]:
+    """Count how many of each pass type's keywords occur in content"""
+    if HAS_AHOCORASICK:
+        scores = dict.fromkeys(_PASS_TYPE_KEYWORDS, 0)
+        for keyword in {keyword for _, keyword in _KEYWORD_AUTOMATON.iter(content)}:
+            for pass_type in _KEYWORD_TYPES[keyword]:
+                scores[pass_type] += 1
+        return scores
+    return {
+        pass_type: sum(1 for kw in keywords if kw in content)
+        for pass_type, keywords in _PASS_TYPE_KEYWORDS.items()
+    }
+
 
 class FieldParser:
     """Handles deterministic field parsing from text using regex patterns"""
@@ -17,8 +214,7 @@ class FieldParser:
     @staticmethod
     def detect_locale(text: str) -> str:
         """Detect locale based on Hebrew characters"""
-        hebrew_pattern = r'[\u0590-\u05FF]'
-        if re.search(hebrew_pattern, text):
+        if _HEBREW_RE.search(text):
             return "he-IL"
         return "en-US"
     
@@ -29,55 +225,20 @@ class FieldParser:
         numbers = []
         codes = []
         
-        # Date patterns (various formats including Hebrew)
-        date_patterns = [
-            r'\b\d{1,2}[/.-]\d{1,2}[/.-]\d{2,4}\b',  # DD/MM/YYYY or MM/DD/YYYY
-            r'\b\d{4}[/.-]\d{1,2}[/.-]\d{1,2}\b',    # YYYY-MM-DD
-            r'\b\d{1,2}\s+(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{2,4}\b',
-            r'\b(Mon|Tue|Wed|Thu|Fri|Sat|Sun)[a-z]*\s+\d{1,2}[/.-]\d{1,2}[/.-]\d{2,4}\b',
-            # Hebrew date patterns
-            r'\b\d{1,2}\s+(ינואר|פברואר|מרץ|אפריל|מאי|יוני|יולי|אוגוסט|ספטמבר|אוקטובר|נובמבר|דצמבר)\s+\d{2,4}\b',
-            r'\b(יום ראשון|יום שני|יום שלישי|יום רביעי|יום חמישי|יום שישי|יום שבת)\s+\d{1,2}[/.-]\d{1,2}[/.-]\d{2,4}\b',
-            r'תאריך[:]\s*\d{1,2}[/.-]\d{1,2}[/.-]\d{2,4}',  # Hebrew "date:"
-        ]
-        
-        for pattern in date_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
+        for pattern in _DATE_PATTERNS:
+            matches = pattern.findall(text)
             dates.extend(matches)
         
-        # Time patterns
-        time_patterns = [
-            r'\b\d{1,2}:\d{2}(?::\d{2})?\s*(?:[AP]M)?\b',
-            r'\b\d{1,2}\.\d{2}\b'  # European time format
-        ]
-        
-        for pattern in time_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
+        for pattern in _TIME_PATTERNS:
+            matches = pattern.findall(text)
             dates.extend(matches)
         
-        # Number patterns (potential seat numbers, amounts, etc.)
-        number_patterns = [
-            r'\b\d{3,}\b',  # 3+ digit numbers
-            r'\$\d+(?:\.\d{2})?\b',  # Currency amounts
-            r'\b\d+[A-Z]\b',  # Seat numbers like 12A
-            r'\b[A-Z]\d+\b'   # Gate numbers like A12
-        ]
-        
-        for pattern in number_patterns:
-            matches = re.findall(pattern, text)
+        for pattern in _NUMBER_PATTERNS:
+            matches = pattern.findall(text)
             numbers.extend(matches)
         
-        # Code patterns (booking refs, PNRs, etc.)
-        code_patterns = [
-            r'\b[A-Z0-9]{6,}\b',  # General alphanumeric codes
-            r'\b[A-Z]{2}\d{3,4}\b',  # Flight numbers
-            r'\bPNR:?\s*([A-Z0-9]+)\b',  # PNR codes
-            r'\bRef:?\s*([A-Z0-9]+)\b',  # Reference codes
-            r'\bBooking:?\s*([A-Z0-9]+)\b'  # Booking codes
-        ]
-        
-        for pattern in code_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
+        for pattern in _CODE_PATTERNS:
+            matches = pattern.findall(text)
             if isinstance(matches[0] if matches else None, tuple):
                 codes.extend([m[0] if isinstance(m, tuple) else m for m in matches])
             else:
@@ -91,36 +252,11 @@ class FieldParser:
         """Extract specific fields using targeted regex patterns with Hebrew support"""
         fields = {}
         
-        # Venue/location patterns (English + Hebrew)
-        venue_patterns = [
-            r'(?:venue|location|theatre|theater|cinema|auditorium)[:]\s*([^\n\r]+)',
-            r'(?:at|@)\s+([A-Z][^,\n\r]{10,50})',
-            # Hebrew venue patterns (enhanced)
-            r'(?:מקום|אולם|בית קולנוע|תיאטרון|אודיטוריום|מרכז|היכל)[:]\s*([^\n\r]+)',
-            r'(?:ב|אצל)[\u0590-\u05FF\s]{2,}',  # Hebrew "at" + Hebrew text
-            r'[:]\s*קולנוע\s*([^\n\r]*)',  # ": קולנוע" pattern
-            r'קולנוע\s+([\u0590-\u05FF\s\w]+)',  # "קולנוע" + venue name
-            r'([\u0590-\u05FF\s]+)\s+קולנוע',  # venue name + "קולנוע"
-        ]
-        
-        for pattern in venue_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _VENUE_PATTERNS:
+            match = pattern.search(text)
             if match and not fields.get('venue'):
                 fields['venue'] = match.group(1).strip()
         
-        # Seat patterns (English + Hebrew)
-        # Based on debug output, seat numbers appear as single digits (8, 9, 10) on separate lines
-        seat_patterns = [
-            r'(?:seat|row|section)[:]\s*([A-Z0-9\-\s]+)',
-            r'\b(?:Row|R)\s*(\d+)\s*(?:Seat|S)\s*([A-Z0-9]+)\b',
-            r'\b(\d+[A-Z])\b',  # Simple seat like 12A
-            # Hebrew seat patterns (enhanced)
-            r'(?:מושב|שורה|מקום|כיסא)[:]\s*([א-ת0-9\-\s]+)',
-            r'(?:שורה|ש)\s*(\d+)\s*(?:מושב|מ)\s*([א-ת0-9]+)',
-            r'מקום\s*(\d+)',  # Hebrew "seat" + number
-            r'^\s*(\d{1,2})\s*$',  # Single/double digit numbers on their own line (seat numbers)
-        ]
-        
         # Look for seat numbers - single digits that appear after venue info
         lines = text.split('\n')
         for i, line in enumerate(lines):
@@ -135,8 +271,8 @@ class FieldParser:
         
         # Fallback to regex patterns if no seat found
         if not fields.get('seat'):
-            for pattern in seat_patterns:
-                match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
+            for pattern in _SEAT_PATTERNS:
+                match = pattern.search(text)
                 if match and not fields.get('seat'):
                     if len(match.groups()) > 1:
                         fields['seat'] = f"Row {match.group(1)} Seat {match.group(2)}"
@@ -146,29 +282,13 @@ class FieldParser:
                         if not ('/' in seat_val or len(seat_val) > 4):
                             fields['seat'] = seat_val
         
-        # Auditorium patterns (English + Hebrew)
-        auditorium_patterns = [
-            r'(?:auditorium|hall|screen|room)[:]\s*([A-Z0-9\-\s]+)',
-            r'(?:אולם|מסך|חדר)[:]\s*([א-ת0-9\-\s]+)',
-            r'(\d+)\s+אולם',  # number + "אולם"
-            r'אולם\s+(\d+)',  # "אולם" + number
-        ]
-        
-        for pattern in auditorium_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _AUDITORIUM_PATTERNS:
+            match = pattern.search(text)
             if match and not fields.get('auditorium'):
                 fields['auditorium'] = match.group(1).strip()
         
-        # Movie title patterns (look for specific patterns in Hebrew tickets)
-        # From the debug output, we can see the movie title "פורמולה1" appears consistently
-        title_patterns = [
-            r'\s([\u0590-\u05FF]+\d+)\s',  # Hebrew text with numbers (like פורמולה1)
-            r'^\s*([\u0590-\u05FF]+\d+)$',  # Hebrew text with numbers on its own line
-            r'([A-Z][a-zA-Z0-9\s]{3,30})',  # English movie titles
-        ]
-        
-        for pattern in title_patterns:
-            matches = re.findall(pattern, text, re.MULTILINE)
+        for pattern in _TITLE_PATTERNS:
+            matches = pattern.findall(text)
             for match in matches:
                 if match and len(match.strip()) > 3 and not fields.get('title'):
                     # Skip common Hebrew words that aren't titles
@@ -177,17 +297,8 @@ class FieldParser:
                         fields['title'] = match.strip()
                         break
         
-        # Name patterns (English + Hebrew)
-        name_patterns = [
-            r'(?:passenger|guest|name)[:]\s*([A-Z][a-z]+\s+[A-Z][a-z]+)',
-            r'\b([A-Z][a-z]+\s+[A-Z][a-z]+)\b',  # Simple first last name
-            # Hebrew name patterns
-            r'(?:נוסע|אורח|שם)[:]\s*([\u0590-\u05FF\s]+)',
-            r'(?:שם מלא|שם הנוסע)[:]\s*([\u0590-\u05FF\s]+)',
-        ]
-        
-        for pattern in name_patterns:
-            matches = re.findall(pattern, text)
+        for pattern in _NAME_PATTERNS:
+            matches = pattern.findall(text)
             if matches and not fields.get('name'):
                 # Take the first reasonable name match
                 for name in matches:
@@ -195,41 +306,24 @@ class FieldParser:
                         fields['name'] = name.strip()
                         break
         
-        # Flight-specific patterns
-        flight_patterns = [
-            r'(?:flight|flt)[:]\s*([A-Z]{2}\d{3,4})',
-            r'\b([A-Z]{2}\s*\d{3,4})\b'
-        ]
-        
-        for pattern in flight_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _FLIGHT_PATTERNS:
+            match = pattern.search(text)
             if match and not fields.get('flight'):
                 fields['flight'] = match.group(1).strip()
         
         # Airport codes
-        airport_pattern = r'\b([A-Z]{3})\s*(?:to|→|-)\s*([A-Z]{3})\b'
-        match = re.search(airport_pattern, text)
+        match = _AIRPORT_RE.search(text)
         if match:
             fields['origin'] = match.group(1)
             fields['destination'] = match.group(2)
         
         # PNR pattern
-        pnr_pattern = r'(?:PNR|Confirmation)[:]\s*([A-Z0-9]{6,})'
-        match = re.search(pnr_pattern, text, re.IGNORECASE)
+        match = _PNR_RE.search(text)
         if match:
             fields['pnr'] = match.group(1)
         
-        # Reservation/booking patterns (English + Hebrew)
-        reservation_patterns = [
-            r'(?:booking|reservation|order|confirmation)[:]\s*([A-Z0-9]+)',
-            r'(?:ref|reference)[:]\s*([A-Z0-9]+)',
-            # Hebrew reservation patterns
-            r'(?:הזמנה|רזרבציה|אישור|הזמנת כרטיס)[:]\s*([A-Z0-9]+)',
-            r'(?:מספר הזמנה|קוד הזמנה|מספר אישור)[:]\s*([A-Z0-9]+)',
-        ]
-        
-        for pattern in reservation_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _RESERVATION_PATTERNS:
+            match = pattern.search(text)
             if match and not fields.get('reservation'):
                 fields['reservation'] = match.group(1).strip()
         
@@ -267,62 +361,14 @@ class FieldParser:
         normalized_text = FieldParser._normalize_hebrew_text(text_lower)
         all_content = normalized_text + " ".join(qr_payloads).lower()
         
-        # Boarding pass indicators (English + Hebrew)
-        boarding_keywords = [
-            'flight', 'boarding', 'gate', 'terminal', 'pnr', 'airline',
-            'departure', 'arrival', 'aircraft', 'seat assignment',
-            # Hebrew boarding pass keywords
-            'טיסה', 'עלייה למטוס', 'שער', 'טרמינל', 'חברת תעופה',
-            'המראה', 'נחיתה', 'מטוס', 'הקצאת מושב', 'כרטיס טיסה'
-        ]
-        
-        # Event ticket indicators (English + Hebrew)
-        event_keywords = [
-            'seat', 'row', 'auditorium', 'screen', 'section', 'event',
-            'ticket', 'venue', 'show', 'concert', 'theater', 'cinema',
-            # Hebrew event keywords (expanded for better detection)
-            'מושב', 'שורה', 'אולם', 'מסך', 'קטע', 'אירוע',
-            'כרטיס', 'מקום', 'הופעה', 'קונצרט', 'תיאטרון', 'בית קולנוע',
-            'קולנוע', 'סרט', 'הקרנה', 'כרטיס קולנוע', 'הצגה',
-            'כרטיסים', 'מושבים', 'כיסא', 'כיסאות', 'מקומות'
-        ]
-        
-        # Coupon indicators (English + Hebrew)
-        coupon_keywords = [
-            'coupon', 'discount', 'promo', 'offer', 'deal', 'save',
-            'percent off', '% off', 'expires',
-            # Hebrew coupon keywords
-            'קופון', 'הנחה', 'פרומו', 'הצעה', 'עסקה', 'חיסכון',
-            'אחוז הנחה', 'פג תוקף', 'בתוקף עד'
-        ]
-        
-        # Store card indicators (English + Hebrew)
-        store_keywords = [
-            'loyalty', 'member', 'points', 'balance', 'club', 'rewards',
-            'card number', 'member since',
-            # Hebrew store card keywords
-            'נאמנות', 'חבר', 'נקודות', 'יתרה', 'מועדון', 'תגמולים',
-            'מספר כרטיס', 'חבר מאז', 'כרטיס חבר'
-        ]
-        
         # Count keyword matches
-        boarding_score = sum(1 for kw in boarding_keywords if kw in all_content)
-        event_score = sum(1 for kw in event_keywords if kw in all_content)
-        coupon_score = sum(1 for kw in coupon_keywords if kw in all_content)
-        store_score = sum(1 for kw in store_keywords if kw in all_content)
+        scores = _score_pass_types(all_content)
         
         # Debug logging for Hebrew text issues
-        logger.debug(f"Pass type detection scores: boarding={boarding_score}, event={event_score}, coupon={coupon_score}, store={store_score}")
-        if 'hebrew' in text_lower or any(ord(c) >= 0x0590 and ord(c) <= 0x05FF for c in text):
+        logger.debug(f"Pass type detection scores: boarding={scores['boardingPass']}, event={scores['eventTicket']}, coupon={scores['coupon']}, store={scores['storeCard']}")
+        if 'hebrew' in text_lower or _HEBREW_RE.search(text):
             logger.debug(f"Hebrew text detected. Sample content: {all_content[:200]}...")
         
-        scores = {
-            'boardingPass': boarding_score,
-            'eventTicket': event_score,
-            'coupon': coupon_score,
-            'storeCard': store_score
-        }
-        
         # Return type with highest score, or generic if tie/no clear winner
         max_score = max(scores.values())
         if max_score >= 2:  # Require at least 2 keyword matches
@@ -343,22 +389,12 @@ class FieldParser:
         if not date_str:
             return None
         
-        # Common date patterns and their formats
-        patterns = [
-            (r'\b(\d{1,2})[/.-](\d{1,2})[/.-](\d{4})\s+(\d{1,2}):(\d{2})', '%d/%m/%Y %H:%M'),
-            (r'\b(\d{4})[/.-](\d{1,2})[/.-](\d{1,2})\s+(\d{1,2}):(\d{2})', '%Y-%m-%d %H:%M'),
-            (r'\b(\d{1,2})[/.-](\d{1,2})[/.-](\d{2})\s+(\d{1,2}):(\d{2})', '%d/%m/%y %H:%M'),
-            # Hebrew datetime patterns (date and time might be on separate lines)
-            (r'(\d{2})/(\d{2})/(\d{4})', '%d/%m/%Y'),  # Just date
-            (r'(\d{1,2}):(\d{2})', '%H:%M'),  # Just time
-        ]
-        
         date_part = None
         time_part = None
         
         # Try to extract date and time separately for Hebrew tickets
-        date_match = re.search(r'(\d{2})/(\d{2})/(\d{4})', date_str)
-        time_match = re.search(r'(\d{1,2}):(\d{2})', date_str)
+        date_match = _DMY_RE.search(date_str)
+        time_match = _HM_RE.search(date_str)
         
         if date_match and time_match:
             try:
@@ -370,7 +406,7 @@ class FieldParser:
         
         # If only date found, try to find time in the broader text
         if date_match:
-            time_match = re.search(r'(\d{1,2}):(\d{2})', date_str)
+            time_match = _HM_RE.search(date_str)
             if time_match:
                 try:
                     date_str_combined = f"{date_match.group(0)} {time_match.group(0)}"
@@ -380,8 +416,8 @@ class FieldParser:
                     pass
         
         # Try standard patterns
-        for pattern, fmt in patterns:
-            match = re.search(pattern, date_str)
+        for pattern, fmt in _DATETIME_PATTERNS:
+            match = pattern.search(date_str)
             if match:
                 try:
                     dt = datetime.strptime(match.group(0), fmt)
@@ -2,19 +2,20 @@
 LLM integration for enhanced field mapping and normalization.
 """
 
+import asyncio
 import json
 import logging
 import os
 import re
-import time
 import random
 from typing import Dict, Optional
 
 try:
     import jsonschema
+    from aiolimiter import AsyncLimiter
     from models import LLM_OUTPUT_SCHEMA, TicketData
 except ImportError as e:
-    raise ImportError(f"Missing required dependency: {e}. Install with: pip install jsonschema")
+    raise ImportError(f"Missing required dependency: {e}. Install with: pip install jsonschema aiolimiter")
 
 # OpenAI dependency
 try:
@@ -23,15 +24,100 @@ try:
 except ImportError:
     HAS_OPENAI = False
 
+# Faster JSON parsing when available
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
+# Static system prompt, built once at import and shared by every request
+SYSTEM_MESSAGE = (
+    "You are a ticket classification and PKPass data extraction expert. "
+    "Analyze the raw text extracted from a PDF and:\n\n"
+    "1. CLASSIFY the ticket type based on content:\n"
+    "   - 'eventTicket': Concerts, sports, theater, shows, conferences\n"
+    "   - 'boardingPass': Flights, trains, buses, ferries\n"
+    "   - 'storeCard': Loyalty cards, membership cards\n"
+    "   - 'coupon': Discounts, vouchers, promotional offers\n"
+    "   - 'generic': Any other type of ticket/pass\n\n"
+    "2. EXTRACT key information for PKPass wallet format:\n"
+    "   - title: Main event/service name (required)\n"
+    "   - serial: Ticket number, booking reference, or unique identifier\n"
+    "   - barcode_message: QR code content or main barcode data\n"
+    "   - datetime: Event date/time in ISO format (YYYY-MM-DDTHH:MM:SS)\n"
+    "   - venue: Location, airport, station, or venue name\n"
+    "   - auditorium: Hall, gate, platform within venue\n"
+    "   - seat: Seat number, row, or seating assignment\n"
+    "   - name: Passenger/attendee name if present\n"
+    "   - flight: Flight number, train number, or service identifier\n"
+    "   - pnr: Passenger Name Record for flights\n"
+    "   - origin: Departure location for transportation\n"
+    "   - destination: Arrival location for transportation\n\n"
+    "RULES:\n"
+    "- Only extract information clearly present in the text\n"
+    "- Prefer QR payload data for barcode_message\n"
+    "- Handle Hebrew/RTL text properly (Hebrew text reads right-to-left)\n"
+    "- Return ONLY valid JSON matching the schema\n"
+    "- Your response must start with { and end with }"
+)
+
+# Attributes the LLM result may set on TicketData
+_TICKET_FIELDS = frozenset(TicketData.__slots__)
+
+
+async def _read_json_stream(stream) -> str:
+    """Accumulate a streamed completion until its top-level JSON object is closed.
+    
+    The stream is closed as soon as the closing brace arrives so trailing tokens
+    are not waited for. Falls back to the full content if no object completes.
+    """
+    parts = []
+    depth = 0
+    in_string = False
+    escaped = False
+    
+    async for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if not delta:
+            continue
+        
+        for i, ch in enumerate(delta):
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif ch == '\\':
+                    escaped = True
+                elif ch == '"':
+                    in_string = False
+            elif ch == '"' and depth:
+                in_string = True
+            elif ch == '{':
+                depth += 1
+            elif ch == '}' and depth:
+                depth -= 1
+                if depth == 0:
+                    parts.append(delta[:i + 1])
+                    await stream.close()
+                    return "".join(parts)
+        
+        parts.append(delta)
+    
+    return "".join(parts)
+
 
 class LLMMapper:
     """Handles LLM-based field mapping and normalization"""
     
-    # Class-level rate limiting state
-    _last_request_time = 0
-    _min_interval = 22  # Minimum seconds between requests (conservative for free tier)
+    # Class-level token buckets shared by all instances (tier 1 limits for gpt-4o-mini)
+    _rpm_limit = 500
+    _tpm_limit = 200000
+    _request_limiter = AsyncLimiter(_rpm_limit, 60)
+    _token_limiter = AsyncLimiter(_tpm_limit, 60)
     
     def __init__(self):
         self.provider = "openai"
@@ -43,22 +129,22 @@ class LLMMapper:
     async def map_fields(self, ticket_data: TicketData, api_key_env: str) -> Optional[Dict]:
         """Use LLM to normalize and map fields"""
         if not self.has_llm:
-            logger.warning(f"LLM provider '{self.provider}' not available")
+            logger.warning("LLM provider '%s' not available", self.provider)
             return None
         
         api_key = os.getenv(api_key_env)
         if not api_key:
-            logger.warning(f"API key not found in environment variable {api_key_env}")
+            logger.warning("API key not found in environment variable %s", api_key_env)
             return None
             
         # Diagnostic logging for API key (safely)
         if api_key:
             key_preview = f"{api_key[:7]}...{api_key[-4:]}" if len(api_key) > 11 else "***"
-            logger.info(f"Using API key: {key_preview} (length: {len(api_key)})")
+            logger.info("Using API key: %s (length: %d)", key_preview, len(api_key))
             
             # Validate API key format
             if not api_key.startswith('sk-'):
-                logger.error(f"Invalid API key format - should start with 'sk-', got: {api_key[:10]}...")
+                logger.error("Invalid API key format - should start with 'sk-', got: %s...", api_key[:10])
                 return None
         
         try:
@@ -67,73 +153,49 @@ class LLMMapper:
             max_chars = 8000  # Roughly 2000 tokens, leaving room for response
             raw_text = ticket_data.raw_text[:max_chars] if len(ticket_data.raw_text) > max_chars else ticket_data.raw_text
             if len(ticket_data.raw_text) > max_chars:
-                logger.info(f"Truncated text from {len(ticket_data.raw_text)} to {max_chars} characters for rate limit management")
-            
-            system_message = (
-                "You are a ticket classification and PKPass data extraction expert. "
-                "Analyze the raw text extracted from a PDF and:\n\n"
-                "1. CLASSIFY the ticket type based on content:\n"
-                "   - 'eventTicket': Concerts, sports, theater, shows, conferences\n"
-                "   - 'boardingPass': Flights, trains, buses, ferries\n"
-                "   - 'storeCard': Loyalty cards, membership cards\n"
-                "   - 'coupon': Discounts, vouchers, promotional offers\n"
-                "   - 'generic': Any other type of ticket/pass\n\n"
-                "2. EXTRACT key information for PKPass wallet format:\n"
-                "   - title: Main event/service name (required)\n"
-                "   - serial: Ticket number, booking reference, or unique identifier\n"
-                "   - barcode_message: QR code content or main barcode data\n"
-                "   - datetime: Event date/time in ISO format (YYYY-MM-DDTHH:MM:SS)\n"
-                "   - venue: Location, airport, station, or venue name\n"
-                "   - auditorium: Hall, gate, platform within venue\n"
-                "   - seat: Seat number, row, or seating assignment\n"
-                "   - name: Passenger/attendee name if present\n"
-                "   - flight: Flight number, train number, or service identifier\n"
-                "   - pnr: Passenger Name Record for flights\n"
-                "   - origin: Departure location for transportation\n"
-                "   - destination: Arrival location for transportation\n\n"
-                "RULES:\n"
-                "- Only extract information clearly present in the text\n"
-                "- Prefer QR payload data for barcode_message\n"
-                "- Handle Hebrew/RTL text properly (Hebrew text reads right-to-left)\n"
-                "- Return ONLY valid JSON matching the schema\n"
-                "- Your response must start with { and end with }"
-            )
+                logger.info("Truncated text from %d to %d characters for rate limit management", len(ticket_data.raw_text), max_chars)
             
-            return await self._map_with_openai(api_key, system_message, ticket_data, raw_text)
+            return await self._map_with_openai(api_key, ticket_data, raw_text)
                 
         except Exception as e:
-            logger.warning(f"LLM mapping failed: {e}")
+            logger.warning("LLM mapping failed: %s", e)
             return None
     
-    async def _map_with_openai(self, api_key: str, system_message: str, ticket_data: TicketData, raw_text: str) -> Optional[Dict]:
+    @staticmethod
+    async def _acquire_rate_limit(estimated_tokens: int) -> None:
+        """Wait for capacity in the shared request (RPM) and token (TPM) buckets"""
+        await LLMMapper._request_limiter.acquire()
+        await LLMMapper._token_limiter.acquire(estimated_tokens)
+    
+    async def _map_with_openai(self, api_key: str, ticket_data: TicketData, raw_text: str) -> Optional[Dict]:
         """Handle OpenAI API integration"""
-        # Simple client initialization - only pass api_key
-        client = openai.OpenAI(api_key=api_key)
-        
-        # Global rate limiting across all instances (for concurrent testing)
-        current_time = time.time()
-        time_since_last = current_time - LLMMapper._last_request_time
-        
-        if time_since_last < LLMMapper._min_interval:
-            wait_time = LLMMapper._min_interval - time_since_last + random.uniform(0, 2)
-            logger.info(f"Rate limiting: waiting {wait_time:.1f} seconds since last request")
-            time.sleep(wait_time)
+        # Simple client initialization - only pass api_key; closed once the response is read
+        async with openai.AsyncOpenAI(api_key=api_key) as client:
+            return await self._request_mapping(client, ticket_data, raw_text)
+    
+    async def _request_mapping(self, client: "openai.AsyncOpenAI", ticket_data: TicketData, raw_text: str) -> Optional[Dict]:
+        """Request the field mapping, retrying on rate limits, and validate the result"""
+        # Build the user message once; it is reused verbatim by the retry path
+        user_message = f"Analyze this raw PDF text and classify the ticket, then extract PKPass data:\n\nRAW TEXT:\n{raw_text}\n\nQR CODE PAYLOADS:\n{json.dumps(ticket_data.qr_payloads)}\n\nDETECTED PATTERNS:\n- Dates: {json.dumps(ticket_data.dates)}\n- Numbers: {json.dumps(ticket_data.numbers)}\n- Codes: {json.dumps(ticket_data.codes)}\n\nReturn JSON with proper classification and extracted fields:"
         
-        LLMMapper._last_request_time = time.time()
+        # Estimated request size: prompt tokens (~4 chars/token) plus room for the response
+        estimated_tokens = len(raw_text) // 4 + 1000
         
         try:
-            response = client.chat.completions.create(
+            await self._acquire_rate_limit(estimated_tokens)
+            response = await client.chat.completions.create(
                 model="gpt-4o-mini",  # Using GPT-4o-mini for better rate limits and lower cost
                 max_tokens=1000,
+                stream=True,
                 temperature=0.1,  # Low temperature for consistent, factual responses
                 messages=[
                     {
                         "role": "system",
-                        "content": system_message
+                        "content": SYSTEM_MESSAGE
                     },
                     {
                         "role": "user", 
-                        "content": f"Analyze this raw PDF text and classify the ticket, then extract PKPass data:\n\nRAW TEXT:\n{raw_text}\n\nQR CODE PAYLOADS:\n{json.dumps(ticket_data.qr_payloads)}\n\nDETECTED PATTERNS:\n- Dates: {json.dumps(ticket_data.dates)}\n- Numbers: {json.dumps(ticket_data.numbers)}\n- Codes: {json.dumps(ticket_data.codes)}\n\nReturn JSON with proper classification and extracted fields:"
+                        "content": user_message
                     }
                 ]
             )
@@ -155,21 +217,23 @@ class LLMMapper:
                     for attempt in range(3):  # Max 3 retries
                         backoff_time = (2 ** attempt) * 30 + random.uniform(0, 10)  # 30s, 60s, 120s + jitter
                         logger.info(f"Waiting {backoff_time:.1f} seconds before retry attempt {attempt + 1}/3")
-                        time.sleep(backoff_time)
+                        await asyncio.sleep(backoff_time)
                         
                         try:
-                            response = client.chat.completions.create(
+                            await self._acquire_rate_limit(estimated_tokens)
+                            response = await client.chat.completions.create(
                                 model="gpt-4o-mini",
                                 max_tokens=800,  # Slightly reduce tokens to help with limits
+                                stream=True,
                                 temperature=0.1,
                                 messages=[
                                     {
                                         "role": "system",
-                                        "content": system_message
+                                        "content": SYSTEM_MESSAGE
                                     },
                                 {
                                     "role": "user",
-                                    "content": f"Analyze this raw PDF text and classify the ticket, then extract PKPass data:\n\nRAW TEXT:\n{raw_text}\n\nQR CODE PAYLOADS:\n{json.dumps(ticket_data.qr_payloads)}\n\nDETECTED PATTERNS:\n- Dates: {json.dumps(ticket_data.dates)}\n- Numbers: {json.dumps(ticket_data.numbers)}\n- Codes: {json.dumps(ticket_data.codes)}\n\nReturn JSON with proper classification and extracted fields:"
+                                    "content": user_message
                                 }
                                 ]
                             )
@@ -194,8 +258,8 @@ class LLMMapper:
                 logger.error(f"🚨 UNEXPECTED API ERROR: {api_error}")
                 return None
         
-        # Parse response with enhanced error handling
-        response_text = response.choices[0].message.content
+        # Read the streamed response; parsing starts as soon as the JSON object closes
+        response_text = await _read_json_stream(response)
         
         # Check for empty or None response
         if not response_text:
@@ -207,11 +271,11 @@ class LLMMapper:
             return None
         
         # Log response for debugging (first 200 chars)
-        logger.debug(f"OpenAI response preview: {response_text[:200]}...")
+        logger.debug("OpenAI response preview: %s...", response_text[:200])
         
         try:
             # Try to parse JSON
-            llm_result = json.loads(response_text)
+            llm_result = _json_loads(response_text)
             
             # Validate against schema
             jsonschema.validate(llm_result, LLM_OUTPUT_SCHEMA)
@@ -228,7 +292,7 @@ class LLMMapper:
             if json_match:
                 try:
                     extracted_json = json_match.group(0)
-                    llm_result = json.loads(extracted_json)
+                    llm_result = _json_loads(extracted_json)
                     jsonschema.validate(llm_result, LLM_OUTPUT_SCHEMA)
                     logger.info("✅ Recovered JSON from wrapped response")
                     return llm_result
@@ -250,7 +314,7 @@ class LLMMapper:
             return
             
         for key, value in llm_result.items():
-            if value is not None and hasattr(ticket_data, key):
+            if value is not None and key in _TICKET_FIELDS:
                 setattr(ticket_data, key, value)
         
-        logger.info("Applied LLM field mapping results")
+        logger.debug("Applied LLM field mapping results")
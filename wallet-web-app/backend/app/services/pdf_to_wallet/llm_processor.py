@@ -5,26 +5,39 @@ This processor sends the PDF as images to OpenAI's Vision API with a structured
 and expects a JSON response containing extracted wallet pass data.
 """
 
+import asyncio
 import base64
+import copy
+import hashlib
 import json
 import logging
 import os
-from typing import Dict, Optional, Any, List
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Any, List, Union
 from io import BytesIO
 
-from llm_prompt import get_vision_extraction_prompt
+from llm_prompt import BATCH_INSTRUCTIONS, STATIC_PREFIX, get_vision_inputs_block
+from models import VISION_SCHEMA
 from response_json_to_pkpass_json import process_llm_data_to_wallet_passes
 
 logger = logging.getLogger(__name__)
 
 # Try to import required libraries
 try:
+    import httpx
     import openai
     HAS_OPENAI = True
 except ImportError:
     HAS_OPENAI = False
     logger.warning("OpenAI library not available. Install with: pip install openai")
 
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HAS_HTTP2 = True
+except ImportError:
+    HAS_HTTP2 = False
+
 try:
     import fitz  # PyMuPDF
     from PIL import Image
@@ -33,6 +46,251 @@ except ImportError:
     HAS_PDF_LIBS = False
     logger.warning("PDF processing libraries not available. Install with: pip install pymupdf pillow")
 
+# Faster JSON parsing when available
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Keywords that OpenAI strict structured outputs do not accept
+_STRICT_UNSUPPORTED_KEYWORDS = frozenset({"minimum", "maximum"})
+
+
+def _strict_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Derive an OpenAI strict-mode schema from a validation schema.
+    
+    Strict mode requires every property to be listed as required and forbids
+    additional properties, so optional values are expressed as nullable types.
+    """
+    strict = {k: v for k, v in schema.items() if k not in _STRICT_UNSUPPORTED_KEYWORDS}
+    if "items" in strict:
+        strict["items"] = _strict_schema(strict["items"])
+    if "properties" not in strict:
+        return strict
+    
+    strict["properties"] = {name: _strict_schema(prop) for name, prop in strict["properties"].items()}
+    strict["required"] = list(strict["properties"])
+    strict["additionalProperties"] = False
+    
+    # Nullable objects are spelled as anyOf in strict mode
+    types = strict.get("type")
+    if isinstance(types, list) and "null" in types:
+        strict["type"] = "object"
+        return {"anyOf": [strict, {"type": "null"}]}
+    return strict
+
+
+VISION_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "wallet_extraction",
+        "schema": _strict_schema(VISION_SCHEMA),
+        "strict": True
+    }
+}
+
+# Batched requests return one extraction per PDF, in input order
+VISION_BATCH_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "wallet_extraction_batch",
+        "schema": _strict_schema({
+            "type": "object",
+            "properties": {"pdfs": {"type": "array", "items": VISION_SCHEMA}}
+        }),
+        "strict": True
+    }
+}
+
+VISION_SYSTEM_MESSAGE = "You are an expert at analyzing ticket/receipt images and extracting structured data to create Apple Wallet passes. Always respond with valid JSON only."
+
+try:
+    # Code-generated validator, much faster than the reflective jsonschema one
+    import fastjsonschema
+    validate_vision_response = fastjsonschema.compile(VISION_SCHEMA)
+    SchemaValidationError = fastjsonschema.JsonSchemaException
+except ImportError:
+    import jsonschema
+    validate_vision_response = jsonschema.Draft7Validator(VISION_SCHEMA).validate
+    SchemaValidationError = jsonschema.ValidationError
+
+try:
+    # SIMD base64 that writes straight into a str
+    from pybase64 import b64encode_as_string
+except ImportError:
+    def b64encode_as_string(data) -> str:
+        return base64.b64encode(data).decode('ascii')
+
+# A PDF given as a filesystem path, or as bytes already held in memory
+PdfSource = Union[str, bytes, BytesIO]
+
+# WebP quality for rendered pages; plenty for OCR-grade vision input
+WEBP_QUALITY = 80
+# Completion budget for a typical extraction, and the ceiling used when it is cut off
+VISION_MAX_TOKENS = 1200
+VISION_RETRY_MAX_TOKENS = 2000
+# Output token limit of the vision models; a request asking for more is rejected outright
+VISION_MAX_OUTPUT_TOKENS = 16384
+# PDFs per batched request, so each gets the full retry budget within the output limit
+VISION_BATCH_SIZE = VISION_MAX_OUTPUT_TOKENS // VISION_RETRY_MAX_TOKENS
+
+# Pages with at least this much extractable text and no embedded images
+# render at 1x and are sent with detail "auto"
+TEXT_HEAVY_CHARS = 200
+# Image-free pages with this much text are sent as plain text instead of an image
+TEXT_ONLY_CHARS = 1000
+# ...provided they draw little vector art: rules and boxes are a handful of path
+# items, while a vector-drawn QR / PDF417 code runs to hundreds and must be seen
+TEXT_ONLY_MAX_DRAWING_ITEMS = 50
+
+
+def _needs_lossless(page_images: List[tuple]) -> bool:
+    """Bilevel (1-bit / CCITT fax) scans smear under lossy coding, so keep them lossless."""
+    return any(img[4] == 1 or img[8] == "CCITTFaxDecode" for img in page_images)
+
+
+# Parsed Vision responses keyed by PDF content hash and request parameters
+VISION_CACHE_SIZE = 50
+_vision_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+# Encoded page content parts keyed by PDF content hash, so re-extracting the
+# same PDF (new prompt, locale or model) skips rendering and base64 encoding.
+# Bounded by total encoded size, since one multi-page 2x render can run to megabytes.
+RENDER_CACHE_MAX_BYTES = 16 * 1024 * 1024
+_render_cache: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+_render_cache_sizes: Dict[str, int] = {}
+_render_cache_bytes = 0
+
+_cache_lock = threading.Lock()
+
+
+def _open_pdf(pdf_path: Union[str, bytes]):
+    """Open a PDF from a path, or straight from memory without touching disk."""
+    if isinstance(pdf_path, (bytes, bytearray)):
+        return fitz.open(stream=pdf_path, filetype="pdf")
+    return fitz.open(pdf_path)
+
+
+def _pdf_digest(pdf_path: Union[str, bytes]) -> str:
+    """SHA-256 of the PDF content, whether given as a path or as bytes."""
+    if isinstance(pdf_path, (bytes, bytearray)):
+        return hashlib.sha256(pdf_path).hexdigest()
+    with open(pdf_path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _vision_cache_key(pdf_path: Union[str, bytes], timezone: str, fallback_locale: str, model: str) -> str:
+    """Build the cache key from the PDF bytes and the parameters that shape the prompt."""
+    return f"{_pdf_digest(pdf_path)}|{timezone}|{fallback_locale}|{model}"
+
+
+def _cache_get(cache: OrderedDict, key: str) -> Optional[Any]:
+    """Return a copy of a cached entry, marking it most recently used."""
+    with _cache_lock:
+        data = cache.get(key)
+        if data is None:
+            return None
+        cache.move_to_end(key)
+    return copy.deepcopy(data)
+
+
+def _cache_put(cache: OrderedDict, key: str, data: Any, max_size: int) -> None:
+    """Store an entry, evicting the least recently used one when full."""
+    with _cache_lock:
+        cache[key] = copy.deepcopy(data)
+        cache.move_to_end(key)
+        if len(cache) > max_size:
+            cache.popitem(last=False)
+
+
+def _render_cache_put(key: str, parts: List[Dict[str, Any]]) -> None:
+    """Store rendered parts, evicting least recently used PDFs until RENDER_CACHE_MAX_BYTES is met."""
+    global _render_cache_bytes
+    # Data URLs are base64, so their length is their size in bytes
+    size = sum(len(part["text"]) if part["type"] == "text" else len(part["image_url"]["url"])
+               for part in parts)
+    if size > RENDER_CACHE_MAX_BYTES:
+        return
+    with _cache_lock:
+        _render_cache_bytes += size - _render_cache_sizes.get(key, 0)
+        _render_cache[key] = copy.deepcopy(parts)
+        _render_cache_sizes[key] = size
+        _render_cache.move_to_end(key)
+        while _render_cache_bytes > RENDER_CACHE_MAX_BYTES:
+            evicted, _ = _render_cache.popitem(last=False)
+            _render_cache_bytes -= _render_cache_sizes.pop(evicted)
+
+
+def _is_monochrome(page, page_images: List[tuple], drawings: List[Dict[str, Any]]) -> bool:
+    """True for image-free pages drawn entirely in gray tones (typically black ink)."""
+    if page_images:
+        return False
+    for block in page.get_text("dict")["blocks"]:
+        for line in block.get("lines", ()):
+            for span in line["spans"]:
+                color = span["color"]
+                if not (color >> 16 & 0xFF) == (color >> 8 & 0xFF) == (color & 0xFF):
+                    return False
+    for drawing in drawings:
+        for color in (drawing.get("color"), drawing.get("fill")):
+            if color and len(set(color)) > 1:
+                return False
+    return True
+
+
+def _render_page(doc, page_num: int) -> Dict[str, Any]:
+    """
+    Render one page of an open PDF to a Vision API content part.
+    
+    Born-digital pages with a rich text layer are sent as text, unless they
+    also draw vector art such as a barcode, or rendered at 1x when their
+    text is moderate; scanned or image-bearing pages get the full 2x render.
+    """
+    page = doc[page_num]
+    text = page.get_text("text").strip()
+    page_images = page.get_images(full=True)
+    drawings = page.get_drawings()
+    text_heavy = not page_images and len(text) >= TEXT_HEAVY_CHARS
+    
+    # Barcodes drawn as vectors are absent from the text layer, so those pages stay images
+    if (text_heavy and len(text) >= TEXT_ONLY_CHARS
+            and sum(len(drawing["items"]) for drawing in drawings) <= TEXT_ONLY_MAX_DRAWING_ITEMS):
+        return {"type": "text", "text": f"Page {page_num + 1} text:\n{text}"}
+    
+    # Text-heavy pages stay legible at 1x; everything else gets 2x zoom
+    zoom = 1.0 if text_heavy else 2.0
+    # No alpha channel, and a single gray channel when the page has no color
+    gray = _is_monochrome(page, page_images, drawings)
+    pix = page.get_pixmap(
+        matrix=fitz.Matrix(zoom, zoom),
+        colorspace=fitz.csGRAY if gray else fitz.csRGB,
+        alpha=False
+    )
+    lossless = _needs_lossless(page_images)
+    
+    # Wrap the raw samples without an intermediate PNG/PPM encode
+    image = Image.frombytes("L" if gray else "RGB", (pix.width, pix.height), pix.samples)
+    # Drop the MuPDF-owned pixmap now rather than when the function returns
+    pix = None
+    
+    # Free the decoded image as soon as it is encoded, before base64 allocates
+    buffer = BytesIO()
+    with image:
+        if lossless:
+            image.save(buffer, format="WEBP", lossless=True)
+        else:
+            image.save(buffer, format="WEBP", quality=WEBP_QUALITY, method=4)
+    
+    # Encode straight from the buffer to str; no bytes copy or base64 bytes object
+    with buffer, buffer.getbuffer() as img_data:
+        data_url = "data:image/webp;base64," + b64encode_as_string(img_data)
+    return {
+        "type": "image_url",
+        "image_url": {"url": data_url, "detail": "auto" if text_heavy else "high"}
+    }
+
 
 class LLMProcessor:
     """Processes entire PDF content using LLM for structured data extraction"""
@@ -53,64 +311,90 @@ class LLMProcessor:
         if not self.has_pdf_libs:
             logger.warning("PDF processing libraries not available - cannot convert PDF to images")
     
-    def pdf_to_images(self, pdf_path: str, max_pages: int = 3) -> List[str]:
+    def _new_client(self) -> "openai.AsyncOpenAI":
+        """
+        Create the AsyncOpenAI client for one extraction call.
+        
+        Callers drive each extraction with asyncio.run, so every call gets a
+        fresh event loop, and pooled httpx connections cannot outlive the loop
+        that opened them. The client is therefore opened and closed inside
+        the coroutine, connections are not reused across calls, and the pool
+        keeps httpx's default limits. HTTP/2, when available, carries a call's
+        concurrent batch requests and truncation retry over one connection.
+        """
+        http_client = httpx.AsyncClient(
+            http2=HAS_HTTP2,
+            timeout=httpx.Timeout(connect=5.0, read=120.0, write=60.0, pool=5.0)
+        )
+        return openai.AsyncOpenAI(api_key=self.api_key, http_client=http_client)
+    
+    def pdf_to_images(self, pdf_path: PdfSource, max_pages: int = 3) -> List[Dict[str, Any]]:
         """
-        Convert PDF pages to base64 encoded images.
+        Convert PDF pages to Vision API content parts.
+        
+        Pages are encoded as lossy WebP, except bilevel scans which are
+        encoded losslessly. Pages whose text layer already carries the
+        content are sent as text.
         
         Args:
-            pdf_path: Path to PDF file
+            pdf_path: Path to PDF file, or its content as bytes / BytesIO
             max_pages: Maximum number of pages to convert (to avoid token limits)
             
         Returns:
-            List of base64 encoded image strings
+            List of ``image_url`` content parts carrying base64 data URLs,
+            or ``text`` parts for text-only pages
         """
         if not self.has_pdf_libs:
             logger.error("Cannot convert PDF to images - missing PDF processing libraries")
             return []
         
+        if isinstance(pdf_path, BytesIO):
+            pdf_path = pdf_path.getvalue()
+        
         try:
-            images = []
-            doc = fitz.open(pdf_path)
+            render_key = f"{_pdf_digest(pdf_path)}|{max_pages}"
+            cached = _cache_get(_render_cache, render_key)
+            if cached is not None:
+                logger.info("Using cached page images for this PDF")
+                return cached
             
-            # Limit pages to avoid token limits
-            num_pages = min(len(doc), max_pages)
-            logger.info(f"Converting {num_pages} pages from PDF to images")
+            with _open_pdf(pdf_path) as doc:
+                # Limit pages to avoid token limits
+                num_pages = min(len(doc), max_pages)
+                logger.info("Converting %d pages from PDF to images", num_pages)
+                images = [_render_page(doc, page_num) for page_num in range(num_pages)]
             
-            for page_num in range(num_pages):
-                page = doc[page_num]
-                
-                # Render page to image with good quality
-                mat = fitz.Matrix(2.0, 2.0)  # 2x zoom for better quality
-                pix = page.get_pixmap(matrix=mat)
-                img_data = pix.tobytes("png")
-                
-                # Convert to base64
-                base64_image = base64.b64encode(img_data).decode('utf-8')
-                images.append(base64_image)
-                
-                logger.info(f"Converted page {page_num + 1} to base64 image ({len(base64_image)} chars)")
+            if logger.isEnabledFor(logging.DEBUG):
+                for page_num, part in enumerate(images):
+                    if part["type"] == "text":
+                        logger.debug("Page %d sent as text (%d chars)", page_num + 1, len(part['text']))
+                    else:
+                        logger.debug("Converted page %d to base64 image (%d chars)", page_num + 1, len(part['image_url']['url']))
             
-            doc.close()
+            _render_cache_put(render_key, images)
             return images
             
         except Exception as e:
-            logger.error(f"Failed to convert PDF to images: {e}")
+            logger.error("Failed to convert PDF to images: %s", e)
             return []
     
     def build_vision_prompt(self, timezone: str = "+00:00", fallback_locale: str = "en-US") -> str:
         """
-        Build the prompt for vision-based LLM processing.
+        Build the per-request part of the vision prompt.
+        
+        The static instructions are sent separately as STATIC_PREFIX so the
+        API can cache them; only this INPUTS block varies between calls.
         
         Args:
             timezone: Timezone offset (e.g., "+03:00")
             fallback_locale: Fallback locale (e.g., "he-IL" or "en-US")
             
         Returns:
-            Formatted prompt string for vision processing
+            Formatted INPUTS block for vision processing
         """
-        return get_vision_extraction_prompt(timezone=timezone, fallback_locale=fallback_locale)
+        return get_vision_inputs_block(timezone=timezone, fallback_locale=fallback_locale)
     
-    async def process_pdf_with_vision(self, pdf_path: str, organization: str, 
+    async def process_pdf_with_vision(self, pdf_path: PdfSource, organization: str, 
                                      pass_type_id: str, team_id: str, 
                                      timezone: str = "+00:00", fallback_locale: str = "en-US",
                                      model: str = "gpt-4o") -> Optional[Dict[str, Any]]:
@@ -118,7 +402,7 @@ class LLMProcessor:
         Process PDF using Vision API to extract structured wallet pass data.
         
         Args:
-            pdf_path: Path to PDF file
+            pdf_path: Path to PDF file, or its content as bytes / BytesIO
             organization: Organization name for the pass
             pass_type_id: Apple Wallet pass type identifier
             team_id: Apple Developer team ID
@@ -137,100 +421,225 @@ class LLMProcessor:
             logger.error("Cannot process PDF - missing PDF processing libraries")
             return None
         
+        if isinstance(pdf_path, BytesIO):
+            pdf_path = pdf_path.getvalue()
+        
         try:
-            # Convert PDF to images
-            images = self.pdf_to_images(pdf_path)
+            # Identical PDFs with identical settings yield the same extraction
+            cache_key = _vision_cache_key(pdf_path, timezone, fallback_locale, model)
+            cached = _cache_get(_vision_cache, cache_key)
+            if cached is not None:
+                logger.info("✅ Using cached Vision API result for this PDF")
+                return cached
+            
+            # Render off the event loop so concurrent requests keep making progress
+            loop = asyncio.get_running_loop()
+            images = await loop.run_in_executor(None, self.pdf_to_images, pdf_path)
             if not images:
                 logger.error("Failed to convert PDF to images")
                 return None
             
-            # Build the vision prompt
+            # Build the per-request INPUTS block
             prompt = self.build_vision_prompt(timezone=timezone, fallback_locale=fallback_locale)
             
-            logger.info(f"Sending PDF images to Vision API (model: {model})")
-            logger.info(f"Number of images: {len(images)}")
+            logger.info("Sending %d PDF page(s) to Vision API (model: %s)", len(images), model)
             
-            # Create OpenAI client
-            client = openai.OpenAI(api_key=self.api_key)
-            
-            # Prepare the message content with images
+            # Prepare the message content: INPUTS block followed by the page images
             content = [
                 {
                     "type": "text",
                     "text": prompt
                 }
             ]
+            content.extend(images)
             
-            # Add each image to the content
-            for i, image in enumerate(images):
-                content.append({
-                    "type": "image_url",
-                    "image_url": {
-                        "url": f"data:image/png;base64,{image}",
-                        "detail": "high"  # High detail for better text recognition
-                    }
-                })
+            messages = [
+                # Static prefix first and byte-identical so OpenAI prompt caching hits
+                {
+                    "role": "system",
+                    "content": STATIC_PREFIX
+                },
+                {
+                    "role": "system",
+                    "content": VISION_SYSTEM_MESSAGE
+                },
+                {
+                    "role": "user", 
+                    "content": content
+                }
+            ]
             
-            # Make the Vision API call
-            response = client.chat.completions.create(
-                model=model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert at analyzing ticket/receipt images and extracting structured data to create Apple Wallet passes. Always respond with valid JSON only."
-                    },
-                    {
-                        "role": "user", 
-                        "content": content
-                    }
-                ],
-                max_tokens=2000,
-                temperature=0.1,  # Low temperature for consistent extraction
-                response_format={"type": "json_object"}  # Ensure JSON response
-            )
+            # Make the Vision API call; retry once with a larger budget if the output was cut off
+            async with self._new_client() as client:
+                for max_tokens in (VISION_MAX_TOKENS, VISION_RETRY_MAX_TOKENS):
+                    response = await client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        max_tokens=max_tokens,
+                        temperature=0.1,  # Low temperature for consistent extraction
+                        response_format=VISION_RESPONSE_FORMAT  # Schema-constrained JSON response
+                    )
+                    if response.choices[0].finish_reason != "length":
+                        break
+                    logger.warning("Vision API response truncated at %d tokens", max_tokens)
             
             # Extract the response content
             response_text = response.choices[0].message.content
-            logger.info(f"LLM response length: {len(response_text)} characters")
+            logger.debug("LLM response length: %d characters", len(response_text))
+            details = getattr(response.usage, "prompt_tokens_details", None)
+            if details is not None:
+                logger.info("Prompt cache: %d of %d prompt tokens cached", details.cached_tokens, response.usage.prompt_tokens)
             
             # Parse JSON response
             try:
-                wallet_pass_data = json.loads(response_text)
-                logger.info("✅ Successfully parsed LLM response as JSON")
+                wallet_pass_data = _json_loads(response_text)
+                logger.debug("Parsed LLM response as JSON")
                 
-                # Validate the new structured response format
-                required_fields = ["category", "category_confidence", "tickets_found", "tickets"]
-                
-                missing_fields = [field for field in required_fields if field not in wallet_pass_data]
-                if missing_fields:
-                    logger.warning(f"LLM response missing required fields: {missing_fields}")
+                if not self._validate_extraction(wallet_pass_data):
                     return None
                 
-                # Validate tickets array
-                tickets = wallet_pass_data.get('tickets', [])
-                tickets_found = wallet_pass_data.get('tickets_found', 0)
-                
-                if len(tickets) != tickets_found:
-                    logger.warning(f"Tickets count mismatch: found {len(tickets)}, expected {tickets_found}")
-                
-                category = wallet_pass_data.get('category', 'Unknown')
-                confidence = wallet_pass_data.get('category_confidence', 0.0)
-                
-                logger.info(f"✅ LLM extracted category: {category} (confidence: {confidence:.2f})")
-                logger.info(f"✅ Found {len(tickets)} ticket(s)")
-                
+                _cache_put(_vision_cache, cache_key, wallet_pass_data, VISION_CACHE_SIZE)
                 return wallet_pass_data
                 
             except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse LLM response as JSON: {e}")
-                logger.error(f"Response content: {response_text[:500]}...")
+                logger.error("Failed to parse LLM response as JSON: %s", e)
+                logger.error("Response content: %.500s...", response_text)
                 return None
                 
         except Exception as e:
-            logger.error(f"LLM processing failed: {e}")
+            logger.error("LLM processing failed: %s", e)
             return None
     
-    async def process_pdf_with_vision_to_wallet_passes(self, pdf_path: str, organization: str, 
+    async def process_pdfs_with_vision(self, pdf_paths: List[PdfSource],
+                                      timezone: str = "+00:00", fallback_locale: str = "en-US",
+                                      model: str = "gpt-4o") -> List[Optional[Dict[str, Any]]]:
+        """
+        Process several PDFs with batched Vision API requests.
+        
+        Pages from the uncached PDFs are sent together, separated by
+        "=== PDF n ===" markers, and the model returns one extraction per PDF.
+        Up to VISION_BATCH_SIZE PDFs share a request, which keeps each request
+        within the model's output limit; the requests run concurrently.
+        
+        Args:
+            pdf_paths: PDF files as paths, bytes or BytesIO
+            timezone: Timezone offset (e.g., "+03:00")
+            fallback_locale: Fallback locale (e.g., "he-IL" or "en-US")
+            model: OpenAI model to use (must support vision)
+            
+        Returns:
+            One extraction dictionary per input PDF, in order; None for failures
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(pdf_paths)
+        if not self.has_openai or not self.has_pdf_libs:
+            logger.error("Cannot process PDFs - missing OpenAI library, API key or PDF libraries")
+            return results
+        
+        pdf_paths = [p.getvalue() if isinstance(p, BytesIO) else p for p in pdf_paths]
+        
+        try:
+            # Serve what we can from the cache; only the rest goes to the API
+            cache_keys = [_vision_cache_key(p, timezone, fallback_locale, model) for p in pdf_paths]
+            pending = []
+            for i, key in enumerate(cache_keys):
+                results[i] = _cache_get(_vision_cache, key)
+                if results[i] is None:
+                    pending.append(i)
+            
+            if not pending:
+                logger.info("✅ Using cached Vision API results for all PDFs")
+                return results
+            
+            # Render all pending PDFs concurrently, off the event loop
+            loop = asyncio.get_running_loop()
+            rendered = await asyncio.gather(*(
+                loop.run_in_executor(None, self.pdf_to_images, pdf_paths[i]) for i in pending
+            ))
+            
+            ready = []
+            for i, images in zip(pending, rendered):
+                if not images:
+                    logger.error("Failed to convert PDF %d to images", i + 1)
+                    continue
+                ready.append((i, images))
+            
+            if not ready:
+                return results
+            
+            # Large batches are split so no request asks for more than the output limit
+            prompt = self.build_vision_prompt(timezone, fallback_locale)
+            chunks = [ready[k:k + VISION_BATCH_SIZE] for k in range(0, len(ready), VISION_BATCH_SIZE)]
+            logger.info("Sending %d PDF(s) to Vision API in %d request(s) (model: %s)", len(ready), len(chunks), model)
+            
+            async with self._new_client() as client:
+                batches = await asyncio.gather(
+                    *(self._request_batch(client, chunk, prompt, model) for chunk in chunks),
+                    return_exceptions=True
+                )
+            
+            for chunk, extractions in zip(chunks, batches):
+                if isinstance(extractions, Exception):
+                    logger.error("Batched Vision request failed for %d PDF(s): %s", len(chunk), extractions)
+                    continue
+                if len(extractions) != len(chunk):
+                    logger.warning("Batch returned %d extraction(s) for %d PDF(s)", len(extractions), len(chunk))
+                for (i, _), wallet_pass_data in zip(chunk, extractions):
+                    if self._validate_extraction(wallet_pass_data):
+                        _cache_put(_vision_cache, cache_keys[i], wallet_pass_data, VISION_CACHE_SIZE)
+                        results[i] = wallet_pass_data
+            
+            return results
+            
+        except Exception as e:
+            logger.error("Batched LLM processing failed: %s", e)
+            return results
+    
+    async def _request_batch(self, client: "openai.AsyncOpenAI", chunk: List[tuple],
+                             prompt: str, model: str) -> List[Dict[str, Any]]:
+        """Send one batched Vision request for (index, page parts) pairs; returns its extractions."""
+        content = [{"type": "text", "text": prompt}]
+        for n, (_, images) in enumerate(chunk, 1):
+            content.append({"type": "text", "text": f"=== PDF {n} ==="})
+            content.extend(images)
+        
+        response = await client.chat.completions.create(
+            model=model,
+            messages=[
+                # Same leading messages as single requests, so the cached prefix is shared
+                {"role": "system", "content": STATIC_PREFIX},
+                {"role": "system", "content": VISION_SYSTEM_MESSAGE},
+                {"role": "system", "content": BATCH_INSTRUCTIONS},
+                {"role": "user", "content": content}
+            ],
+            max_tokens=min(VISION_RETRY_MAX_TOKENS * len(chunk), VISION_MAX_OUTPUT_TOKENS),
+            temperature=0.1,
+            response_format=VISION_BATCH_RESPONSE_FORMAT
+        )
+        return _json_loads(response.choices[0].message.content).get("pdfs", [])
+    
+    def _validate_extraction(self, wallet_pass_data: Dict[str, Any]) -> bool:
+        """Validate one extraction against VISION_SCHEMA and log its summary."""
+        # Validate the structured response format in a single pass
+        try:
+            validate_vision_response(wallet_pass_data)
+        except SchemaValidationError as e:
+            logger.warning("LLM response failed schema validation: %s", e)
+            return False
+        
+        tickets = wallet_pass_data['tickets']
+        tickets_found = wallet_pass_data['tickets_found']
+        
+        if len(tickets) != tickets_found:
+            logger.warning("Tickets count mismatch: found %d, expected %d", len(tickets), tickets_found)
+        
+        category = wallet_pass_data['category']
+        confidence = wallet_pass_data['category_confidence']
+        
+        logger.info("✅ LLM extracted category: %s (confidence: %.2f), %d ticket(s)",
+                    category, confidence, len(tickets))
+        return True
+    
+    async def process_pdf_with_vision_to_wallet_passes(self, pdf_path: PdfSource, organization: str, 
                                                      pass_type_id: str, team_id: str, 
                                                      timezone: str = "+00:00", fallback_locale: str = "en-US",
                                                      model: str = "gpt-4o") -> Optional[List[Dict[str, Any]]]:
@@ -241,7 +650,7 @@ class LLMProcessor:
         to return ready-to-use Apple Wallet pass JSON objects.
         
         Args:
-            pdf_path: Path to the PDF file
+            pdf_path: Path to the PDF file, or its content as bytes / BytesIO
             organization: Organization name for the pass
             pass_type_id: Apple Wallet pass type identifier  
             team_id: Apple Developer team identifier
@@ -271,14 +680,14 @@ class LLMProcessor:
             )
             
             if wallet_passes:
-                logger.info(f"✅ Successfully generated {len(wallet_passes)} Apple Wallet pass(es)")
+                logger.info("✅ Successfully generated %d Apple Wallet pass(es)", len(wallet_passes))
                 return wallet_passes
             else:
                 logger.error("❌ No wallet passes were generated from LLM data")
                 return None
                 
         except Exception as e:
-            logger.error(f"❌ Failed to convert LLM data to wallet passes: {e}")
+            logger.error("❌ Failed to convert LLM data to wallet passes: %s", e)
             return None
     
     def is_available(self) -> bool:
@@ -5,18 +5,9 @@ This module contains the prompt templates used by the LLM processor
 for extracting structured data from PDF documents.
 """
 
-def get_vision_extraction_prompt(timezone: str = "+00:00", fallback_locale: str = "en-US") -> str:
-    """
-    Get the vision-based extraction prompt for LLM processing.
-    
-    Args:
-        timezone: Timezone offset (e.g., "+03:00")
-        fallback_locale: Fallback locale (e.g., "he-IL" or "en-US")
-        
-    Returns:
-        Formatted prompt string for vision processing
-    """
-    prompt = f"""# Wallet Pass Extractor — Classification + Structured Fields (NO Wallet JSON)
+# Everything that does not depend on the request. Kept byte-identical across
+# calls and sent first, so OpenAI prompt caching can reuse the prefix.
+STATIC_PREFIX = """# Wallet Pass Extractor — Classification + Structured Fields (NO Wallet JSON)
 
 You are an expert ticket/pass parser.
 You will receive PDF page images (and optionally plain OCR text).
@@ -26,16 +17,16 @@ Your job is to **classify**, **count tickets**, and **extract fields** only.
 ALLOWED CATEGORIES (choose exactly one):
 ["Boarding pass","Coupon","Event ticket","Store card","Generic"]
 
-INPUTS I PROVIDE AT RUNTIME
-- timezone: {timezone}                 # e.g., +03:00
-- fallback_locale: {fallback_locale}   # e.g., he-IL or en-US
+INPUTS I PROVIDE AT RUNTIME (see the INPUTS block in my message)
+- timezone                 # e.g., +03:00
+- fallback_locale          # e.g., he-IL or en-US
 - Visual input: the PDF page images I attach (and/or the original PDF). Use visual layout, text, and graphics. If the PDF text layer is readable, use it; otherwise rely on OCR text.
 
 GLOBAL RULES
 1) No hallucination. If a value is unknown → null.
 2) Return both raw strings (original language/script) and normalized values where applicable.
 3) Datetime normalization: convert to ISO 8601 "YYYY-MM-DDTHH:MM:SS±HH:MM".
-   - If the source lacks a timezone, apply {timezone}.
+   - If the source lacks a timezone, apply the runtime timezone.
 4) Currency normalization:
    - If certain: put numeric price.amount and ISO currency (e.g., ILS, USD) in price.currency.
    - Always include price.raw (original text) if present; if unsure of currency, leave currency null.
@@ -50,7 +41,7 @@ GLOBAL RULES
 OUTPUT FORMAT — RETURN ONE JSON OBJECT ONLY (STRICT)
 Do not include any extra text, markdown, or comments. Just raw JSON matching this shape:
 
-{{
+{
   "category": "Boarding pass | Coupon | Event ticket | Store card | Generic",
   "category_confidence": 0.0,
   "tickets_found": 0,
@@ -60,7 +51,7 @@ Do not include any extra text, markdown, or comments. Just raw JSON matching thi
   "foregroundColor": "rgb(255, 255, 255)" | suitable rgb() but not black,
   "labelColor": "rgb(255, 255, 255)" | suitable rgb() but not black,
   "tickets": [
-    {{
+    {
       "raw_title": "string|null",
       "normalized_title": "string|null",
 
@@ -85,16 +76,16 @@ Do not include any extra text, markdown, or comments. Just raw JSON matching thi
 
       "purchaser_name": "string|null",
 
-      "price": {{
+      "price": {
         "amount": "number|null",
         "currency": "string|null",
         "raw": "string|null"
-      }},
+      },
 
       "barcode_message": "string|null",
 
-      "category_specific": {{
-        "boarding_pass": {{
+      "category_specific": {
+        "boarding_pass": {
           "passenger_name": "string|null",
           "carrier": "string|null",
           "flight_number": "string|null",
@@ -105,16 +96,16 @@ Do not include any extra text, markdown, or comments. Just raw JSON matching thi
           "seat": "string|null",
           "class": "string|null",
           "pnr": "string|null"
-        }},
-        "coupon": {{
+        },
+        "coupon": {
           "merchant": "string|null",
           "discount_type": "string|null",
           "discount_value": "string|null",
           "code": "string|null",
           "expiration": "YYYY-MM-DDTHH:MM:SS±HH:MM|null",
           "terms": "string|null"
-        }},
-        "event_ticket": {{
+        },
+        "event_ticket": {
           "performer": "string|null",
           "home_team": "string|null",
           "away_team": "string|null",
@@ -131,8 +122,8 @@ Do not include any extra text, markdown, or comments. Just raw JSON matching thi
           "ticket_number": "string|null",
           "order_id": "string|null",
           "terms": "string|null"
-        }},
-        "store_card": {{
+        },
+        "store_card": {
           "program_name": "string|null",
           "merchant": "string|null",
           "card_number": "string|null",
@@ -141,8 +132,8 @@ Do not include any extra text, markdown, or comments. Just raw JSON matching thi
           "points": "number|null",
           "tier": "string|null",
           "expiration": "YYYY-MM-DDTHH:MM:SS±HH:MM|null"
-        }},
-        "generic": {{
+        },
+        "generic": {
           "entity": "string|null",
           "subtitle": "string|null",
           "notes": "string|null",
@@ -152,35 +143,35 @@ Do not include any extra text, markdown, or comments. Just raw JSON matching thi
           "location": "string|null",
           "contact_phone": "string|null",
           "website": "string|null"
-        }}
-      }},
+        }
+      },
 
-      "evidence": {{
+      "evidence": {
         "title": "string|null",
         "datetime": "string|null",
         "seat_block": "string|null",
         "price": "string|null",
         "ticket_or_order": "string|null"
-      }},
+      },
 
-      "confidence": {{
+      "confidence": {
         "record": 0.0,
-        "fields": {{
+        "fields": {
           "normalized_datetime": 0.0,
           "row": 0.0,
           "seat": 0.0,
           "price.amount": 0.0,
           "barcode_message": 0.0
-        }}
-      }},
+        }
+      },
 
-      "page_hint": {{
+      "page_hint": {
         "page_index": "number|null",
         "notes": "string|null"
-      }}
-    }}
+      }
+    }
   ]
-}}
+}
 
 EXTRACTION CUES
 - Event ticket: performer/team, venue, section/row/seat, show date/time, ticket/order IDs, price.
@@ -192,9 +183,45 @@ EXTRACTION CUES
 VALIDATION REQUIREMENTS
 - tickets_found MUST equal tickets.length.
 - If any normalized_* is present, also include its raw_* counterpart if visible.
-- If locale can't be detected, set locale_detected = null (then I will apply {fallback_locale} downstream).
+- If locale can't be detected, set locale_detected = null (then I will apply fallback_locale downstream).
 
 FINAL REQUIREMENT
 Output **only** the JSON object described above. No extra text."""
 
-    return prompt
+# Appended after STATIC_PREFIX when several PDFs share one request
+BATCH_INSTRUCTIONS = """MULTIPLE PDFS
+The attached pages come from several independent PDFs. Each PDF starts with a "=== PDF n ===" marker followed by its pages.
+Apply every rule above to each PDF separately, then return {"pdfs": [...]} holding one JSON object of the shape above per PDF, in marker order."""
+
+# The INPUTS block and full prompt, pre-split around their two insertion points
+_INPUTS_PREFIX = "INPUTS\n- timezone: "
+_PREFIX = STATIC_PREFIX + "\n\n" + _INPUTS_PREFIX
+_MID = "\n- fallback_locale: "
+
+
+def get_vision_inputs_block(timezone: str = "+00:00", fallback_locale: str = "en-US") -> str:
+    """
+    Get the per-request INPUTS block that accompanies STATIC_PREFIX.
+    
+    Args:
+        timezone: Timezone offset (e.g., "+03:00")
+        fallback_locale: Fallback locale (e.g., "he-IL" or "en-US")
+        
+    Returns:
+        Formatted INPUTS block
+    """
+    return _INPUTS_PREFIX + timezone + _MID + fallback_locale
+
+
+def get_vision_extraction_prompt(timezone: str = "+00:00", fallback_locale: str = "en-US") -> str:
+    """
+    Get the vision-based extraction prompt for LLM processing.
+    
+    Args:
+        timezone: Timezone offset (e.g., "+03:00")
+        fallback_locale: Fallback locale (e.g., "he-IL" or "en-US")
+        
+    Returns:
+        Formatted prompt string for vision processing
+    """
+    return _PREFIX + timezone + _MID + fallback_locale
@@ -3,34 +3,33 @@ Data models and schemas for the wallet pass converter.
 """
 
 from typing import List, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 # Todo:: serial number should be unique and not generated from the raw text
-@dataclass
+@dataclass(slots=True)
 class TicketData:
     """Container for extracted ticket information"""
     
-    def __init__(self):
-        self.raw_text: str = ""
-        self.qr_payloads: List[str] = []
-        self.dates: List[str] = []
-        self.numbers: List[str] = []
-        self.codes: List[str] = []
-        self.title: Optional[str] = None
-        self.type: str = "generic"
-        self.datetime: Optional[str] = None
-        self.venue: Optional[str] = None
-        self.auditorium: Optional[str] = None
-        self.seat: Optional[str] = None
-        self.reservation: Optional[str] = None
-        self.name: Optional[str] = None
-        self.pnr: Optional[str] = None
-        self.flight: Optional[str] = None
-        self.origin: Optional[str] = None
-        self.destination: Optional[str] = None
-        self.serial: str = ""
-        self.barcode_message: str = ""
-        self.locale: str = "en-US"
+    raw_text: str = ""
+    qr_payloads: List[str] = field(default_factory=list)
+    dates: List[str] = field(default_factory=list)
+    numbers: List[str] = field(default_factory=list)
+    codes: List[str] = field(default_factory=list)
+    title: Optional[str] = None
+    type: str = "generic"
+    datetime: Optional[str] = None
+    venue: Optional[str] = None
+    auditorium: Optional[str] = None
+    seat: Optional[str] = None
+    reservation: Optional[str] = None
+    name: Optional[str] = None
+    pnr: Optional[str] = None
+    flight: Optional[str] = None
+    origin: Optional[str] = None
+    destination: Optional[str] = None
+    serial: str = ""
+    barcode_message: str = ""
+    locale: str = "en-US"
 
 
 # JSON Schema for LLM output validation - Enhanced for PKPass compatibility
@@ -115,3 +114,90 @@ LLM_OUTPUT_SCHEMA = {
     },
     "additionalProperties": False
 }
+
+# Reusable fragments for the Vision response schema
+_NULLABLE_STRING = {"type": ["string", "null"]}
+_NULLABLE_NUMBER = {"type": ["number", "null"]}
+_CONFIDENCE = {"type": "number", "minimum": 0, "maximum": 1}
+
+
+def _nullable_object(*names: str, **typed: dict) -> dict:
+    """Object schema whose listed properties are nullable strings unless typed."""
+    properties = {name: _NULLABLE_STRING for name in names}
+    properties.update(typed)
+    return {"type": ["object", "null"], "properties": properties}
+
+
+# Shape of the Vision API extraction response (see llm_prompt.STATIC_PREFIX).
+# Only the fields the pipeline depends on are required; the rest are typed
+# so malformed values are rejected up front.
+VISION_SCHEMA = {
+    "type": "object",
+    "required": ["category", "category_confidence", "tickets_found", "tickets"],
+    "properties": {
+        "category": {
+            "type": "string",
+            "enum": ["Boarding pass", "Coupon", "Event ticket", "Store card", "Generic"]
+        },
+        "category_confidence": _CONFIDENCE,
+        "tickets_found": {
+            "type": "integer",
+            "minimum": 0
+        },
+        "locale_detected": _NULLABLE_STRING,
+        "sanity_warnings": {
+            "type": ["array", "null"],
+            "items": {"type": "string"}
+        },
+        "backgroundColor": _NULLABLE_STRING,
+        "foregroundColor": _NULLABLE_STRING,
+        "labelColor": _NULLABLE_STRING,
+        "tickets": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    **{name: _NULLABLE_STRING for name in (
+                        "raw_title", "normalized_title", "raw_datetime", "normalized_datetime",
+                        "raw_venue", "normalized_venue", "address",
+                        "section", "row", "seat", "zone", "gate", "entrance", "door",
+                        "ticket_id", "order_id", "reservation_code", "purchaser_name",
+                        "barcode_message"
+                    )},
+                    "price": _nullable_object("currency", "raw", amount=_NULLABLE_NUMBER),
+                    "category_specific": _nullable_object(
+                        boarding_pass=_nullable_object(
+                            "passenger_name", "carrier", "flight_number", "origin", "destination",
+                            "gate", "boarding_time", "seat", "class", "pnr"
+                        ),
+                        coupon=_nullable_object(
+                            "merchant", "discount_type", "discount_value", "code", "expiration", "terms"
+                        ),
+                        event_ticket=_nullable_object(
+                            "performer", "home_team", "away_team", "league_or_competition",
+                            "doors_open_time", "gate", "entrance", "door", "section", "row", "seat",
+                            "zone", "ticket_type", "ticket_number", "order_id", "terms"
+                        ),
+                        store_card=_nullable_object(
+                            "program_name", "merchant", "card_number", "balance_currency", "tier",
+                            "expiration", balance_amount=_NULLABLE_NUMBER, points=_NULLABLE_NUMBER
+                        ),
+                        generic=_nullable_object(
+                            "entity", "subtitle", "notes", "valid_from", "valid_to", "location",
+                            "contact_phone", "website",
+                            reference_numbers={"type": ["array", "null"], "items": {"type": "string"}}
+                        )
+                    ),
+                    "evidence": _nullable_object("title", "datetime", "seat_block", "price", "ticket_or_order"),
+                    "confidence": _nullable_object(
+                        record=_CONFIDENCE,
+                        fields=_nullable_object(**{name: _NULLABLE_NUMBER for name in (
+                            "normalized_datetime", "row", "seat", "price.amount", "barcode_message"
+                        )})
+                    ),
+                    "page_hint": _nullable_object("notes", page_index=_NULLABLE_NUMBER)
+                }
+            }
+        }
+    }
+}
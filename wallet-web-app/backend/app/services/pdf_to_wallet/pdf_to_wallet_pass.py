@@ -34,6 +34,16 @@ import logging
 import os
 import sys
 
+# Faster JSON output when available
+try:
+    import orjson
+
+    def _dumps_pretty(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+except ImportError:
+    def _dumps_pretty(obj) -> str:
+        return json.dumps(obj, indent=2)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -131,7 +141,7 @@ def main():
             return 1
         
         # Output to stdout
-        print(json.dumps(passes, indent=2))
+        print(_dumps_pretty(passes))
         
         # Save to files
         FileUtils.save_passes(passes, args.outdir)
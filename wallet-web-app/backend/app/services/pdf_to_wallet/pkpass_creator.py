@@ -15,7 +15,9 @@ Environment Variables Required:
 """
 
 import argparse
+import atexit
 import json
+import logging
 import os
 import re
 import shutil
@@ -23,31 +25,79 @@ import subprocess
 import sys
 import tempfile
 import hashlib
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional
-from zipfile import ZipFile, ZIP_DEFLATED
+from typing import Callable, Dict, Any, Iterable, List, Optional, Tuple, Union
+from zipfile import ZipFile, ZipInfo, ZIP_DEFLATED, ZIP_STORED
+
+from _paths import ENV_PATH
 
 # Load environment variables
 try:
     from dotenv import load_dotenv
-    env_path = Path(__file__).parent.parent.parent.parent.parent / '.env'
-    if env_path.exists():
-        load_dotenv(env_path)
+    if ENV_PATH.exists():
+        load_dotenv(ENV_PATH)
 except ImportError:
     pass
 
+logger = logging.getLogger(__name__)
+
+# In-process P12 parsing and signing; falls back to the openssl CLI when unavailable
+try:
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.serialization import pkcs7, pkcs12
+    from cryptography.x509.oid import NameOID
+    HAS_CRYPTOGRAPHY = True
+except ImportError:
+    HAS_CRYPTOGRAPHY = False
+
+# Faster JSON (de)serialization when available
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+# Chunk size for streaming pass files into the archive
+COPY_CHUNK_SIZE = 128 * 1024
+# Write buffer for the output archive, so small ZIP header writes coalesce
+ARCHIVE_BUFFER_SIZE = 1 << 20
+
+# A pass file is either in-memory bytes or a path to read it from
+PassSource = Union[bytes, Path]
+
 REQ_JSON_KEYS = [
     "formatVersion", "passTypeIdentifier", "teamIdentifier",
     "serialNumber", "organizationName", "description"
 ]
 
+def _sha1():
+    """SHA-1 for manifest digests (a format requirement, not a security control),
+    so FIPS-restricted builds still serve it from OpenSSL's accelerated code."""
+    return hashlib.sha1(usedforsecurity=False)
+
+def _file_sha1(path: Path) -> str:
+    """SHA-1 hex digest of a file, streamed through hashlib's C loop."""
+    with open(path, "rb", buffering=0) as f:
+        return hashlib.file_digest(f, _sha1).hexdigest()
+
+@lru_cache(maxsize=256)
+def _cached_sha1(path: str, mtime_ns: int, size: int) -> str:
+    """Digest of a shared asset; the stat fields in the key invalidate it when the file changes."""
+    return _file_sha1(Path(path))
+
 def run(cmd, cwd=None, check=True):
     """Run external command with clean output and unified display."""
-    print("$", " ".join(cmd))
+    logger.debug("$ %s", " ".join(cmd))
     proc = subprocess.run(cmd, cwd=cwd, text=True,
                           stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
     if check and proc.returncode != 0:
-        print(proc.stdout)
+        logger.error(proc.stdout)
         raise SystemExit(f"Command failed: {' '.join(cmd)}")
     return proc.stdout
 
@@ -59,35 +109,59 @@ def assert_exists(path: Path, label: str):
 def load_pass_json(path: Path):
     """Load and validate pass.json file."""
     try:
-        data = json.loads(path.read_text(encoding="utf-8"))
+        data = _json_loads(path.read_bytes())
     except Exception as e:
         raise SystemExit(f" Invalid pass.json or not UTF-8: {e}")
+    check_required_keys(data)
+    return data
+
+def check_required_keys(data: Dict[str, Any]):
+    """Check that pass data has every key Wallet requires."""
     missing = [k for k in REQ_JSON_KEYS if k not in data]
     if missing:
         raise SystemExit(f" Missing required keys in pass.json: {', '.join(missing)}")
-    return data
+
+def _name_attribute(name, oid) -> Optional[str]:
+    """First value of an attribute in an x509 Name, or None."""
+    attrs = name.get_attributes_for_oid(oid)
+    return attrs[0].value if attrs else None
+
+# Subject fields in openssl's "subject=UID = ..., OU = ..." output
+_UID_RE = re.compile(r"UID\s*=\s*([^,]+)")
+_OU_RE = re.compile(r"OU\s*=\s*([^,]+)")
 
 def extract_uid_ou_from_p12(p12_path: Path, cert_password: str):
     """Extract UID and OU from P12 certificate."""
-    out = run(["openssl", "pkcs12", "-in", str(p12_path), "-info", "-nokeys", "-passin", f"pass:{cert_password}"], check=True)
-    # Example lines: "subject=UID = pass.com.x, CN = Pass Type ID: pass.com.x, OU = ABCDE12345, ..."
-    uid = None
-    ou  = None
-    for line in out.splitlines():
-        if "subject=" in line:
-            m_uid = re.search(r"UID\s*=\s*([^,]+)", line)
-            m_ou  = re.search(r"OU\s*=\s*([^,]+)", line)
-            if m_uid: uid = m_uid.group(1).strip()
-            if m_ou:  ou  = m_ou.group(1).strip()
+    if HAS_CRYPTOGRAPHY:
+        # Read the subject RDNs directly; no subprocess, and the password stays off the command line
+        _, cert, _ = pkcs12.load_key_and_certificates(p12_path.read_bytes(), cert_password.encode())
+        uid = _name_attribute(cert.subject, NameOID.USER_ID)
+        ou = _name_attribute(cert.subject, NameOID.ORGANIZATIONAL_UNIT_NAME)
+    else:
+        out = run(["openssl", "pkcs12", "-in", str(p12_path), "-info", "-nokeys", "-passin", f"pass:{cert_password}"], check=True)
+        # Example lines: "subject=UID = pass.com.x, CN = Pass Type ID: pass.com.x, OU = ABCDE12345, ..."
+        uid = None
+        ou  = None
+        for line in out.splitlines():
+            if "subject=" in line:
+                m_uid = _UID_RE.search(line)
+                m_ou  = _OU_RE.search(line)
+                if m_uid: uid = m_uid.group(1).strip()
+                if m_ou:  ou  = m_ou.group(1).strip()
     if not uid or not ou:
-        print(" Could not extract UID/OU from P12; continuing anyway, verify match manually.")
+        logger.warning(" Could not extract UID/OU from P12; continuing anyway, verify match manually.")
     else:
-        print(f"Detected from P12 → UID={uid}  OU={ou}")
+        logger.debug("Detected from P12 → UID=%s  OU=%s", uid, ou)
     return uid, ou
 
-def copy_inputs_to_build(build_dir: Path, assets_dir: Path = None):
-    """Copy asset files that will be included in the pass to build directory."""
-    build_dir.mkdir(parents=True, exist_ok=True)
+def collect_pass_inputs(pass_json: bytes, assets_dir: Path = None) -> List[Tuple[str, PassSource]]:
+    """Collect the files that go into the pass, read straight from where they live.
+    
+    Returns (archive name, source) pairs in sorted order: the serialized
+    pass.json bytes, then the image assets and any *.lproj localization
+    files as paths.
+    """
+    entries = [("pass.json", pass_json)]
     
     # Required image assets (pass.json is handled separately)
     must = ["icon.png", "icon@2x.png"]
@@ -98,56 +172,31 @@ def copy_inputs_to_build(build_dir: Path, assets_dir: Path = None):
         "thumbnail.png", "thumbnail@2x.png",
     ]
     
-    # If assets_dir is provided, copy from there, otherwise from current directory
+    # If assets_dir is provided, read from there, otherwise from current directory
     base_dir = assets_dir if assets_dir else Path(".")
     
     for name in must:
         src = base_dir / name
         assert_exists(src, name)
-        shutil.copy2(src, build_dir / name)
-        print(f"📎 Added required asset: {name}")
+        entries.append((name, src))
+        logger.debug("📎 Added required asset: %s", name)
         
     for name in optional:
         src = base_dir / name
         if src.is_file():
-            shutil.copy2(src, build_dir / name)
-            print(f"📎 Added optional asset: {name}")
+            entries.append((name, src))
+            logger.debug("📎 Added optional asset: %s", name)
     
-    # Localization directories *.lproj (if any)
-    for item in Path(".").glob("*.lproj"):
-        if item.is_dir():
-            shutil.copytree(item, build_dir / item.name, dirs_exist_ok=True)
+    # Localization directories *.lproj (if any); they are flat, and macOS metadata stays behind
+    with os.scandir(".") as it:
+        for entry in it:
+            if (entry.name.endswith(".lproj") and not entry.name.startswith(".")
+                    and entry.is_dir(follow_symlinks=False)):
+                with os.scandir(entry.path) as lproj:
+                    entries.extend((f"{entry.name}/{f.name}", Path(f.path)) for f in lproj if _is_pass_file(f))
     
-    # Clean up .DS_Store files if copied
-    for ds in build_dir.rglob(".DS_Store"):
-        try: ds.unlink()
-        except: pass
-
-def build_manifest(build_dir: Path):
-    """Create manifest.json for all files in the pass (root and *.lproj), excluding manifest/signature/hidden files."""
-    manifest = {}
-    for base, dirs, files in os.walk(build_dir):
-        rel_base = Path(base).relative_to(build_dir)
-        # Include root or *.lproj only
-        if str(rel_base) != "." and not str(rel_base).endswith(".lproj"):
-            continue
-        # Don't access hidden directories
-        dirs[:] = [d for d in dirs if not d.startswith(".") and (d.endswith(".lproj") or str(rel_base) == ".")]
-        for fn in files:
-            if fn in ("manifest.json", "signature") or fn.startswith("."):
-                continue
-            path = Path(base) / fn
-            rel  = path.relative_to(build_dir).as_posix()
-            # Calculate SHA-1
-            with open(path, "rb") as f:
-                digest = hashlib.sha1(f.read()).hexdigest()
-            manifest[rel] = digest
-    if not manifest:
-        raise SystemExit(" manifest.json is empty — check that pass.json and icon.png exist in the project directory.")
-    out_path = build_dir / "manifest.json"
-    out_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
-    print(f"manifest.json created ({len(manifest)} items)")
-    return out_path
+    entries.sort()
+    return entries
 
 def sign_manifest(build_dir: Path, signer_cert_pem: Path, signer_key_pem: Path, wwdr_pem: Path):
     """Sign the manifest.json file."""
@@ -170,34 +219,74 @@ def sign_manifest(build_dir: Path, signer_cert_pem: Path, signer_key_pem: Path,
     ])
     if verify.returncode != 0:
         raise SystemExit("❌ Signature verification failed")
-    print("Signature OK")
+    logger.debug("Signature OK")
     return sig_path
 
-def zip_pkpass(build_dir: Path, out_path: Path):
-    """Create the final .pkpass ZIP file."""
+def sign_manifest_in_process(manifest: bytes, signer_cert, signer_key, wwdr_cert) -> bytes:
+    """Sign manifest bytes with already-loaded certificate objects (no openssl exec)."""
+    return (
+        pkcs7.PKCS7SignatureBuilder()
+        .set_data(manifest)
+        .add_signer(signer_cert, signer_key, hashes.SHA256())
+        .add_certificate(wwdr_cert)
+        .sign(serialization.Encoding.DER, [pkcs7.PKCS7Options.Binary, pkcs7.PKCS7Options.DetachedSignature])
+    )
+
+def _is_pass_file(entry: os.DirEntry) -> bool:
+    """Regular, non-hidden file that belongs in the manifest."""
+    return (entry.is_file(follow_symlinks=False) and not entry.name.startswith(".")
+            and entry.name not in ("manifest.json", "signature"))
+
+def _zip_entry(name: str) -> ZipInfo:
+    """ZipInfo with a fixed timestamp and mode.
+    
+    Identical inputs give identical data entries and manifest.json. The
+    archive as a whole still differs per build, because the PKCS#7 signature
+    carries a signingTime attribute; compare manifests, not archives.
+    """
+    zinfo = ZipInfo(name, date_time=(1980, 1, 1, 0, 0, 0))
+    zinfo.external_attr = 0o644 << 16
+    # PNGs are already deflate-compressed; storing them skips a pointless recompress
+    zinfo.compress_type = ZIP_STORED if name.lower().endswith(".png") else ZIP_DEFLATED
+    return zinfo
+
+def build_and_zip(entries: Iterable[Tuple[str, PassSource]], out_path: Path, sign: Callable[[bytes], bytes]):
+    """Write the .pkpass ZIP directly from its sources.
+    
+    ``entries`` holds (archive name, source) pairs, as returned by
+    collect_pass_inputs. In-memory sources are hashed and written as-is.
+    Digests of files come from a cache keyed on their stat, so unchanged
+    assets are only hashed once across builds.
+    manifest.json and its signature (produced by ``sign`` from the manifest
+    bytes) are appended last.
+    """
     if out_path.exists():
         out_path.unlink()
-    # Ensure there are no metadata files
-    for junk in build_dir.rglob("__MACOSX"):
-        shutil.rmtree(junk, ignore_errors=True)
-    for ds in build_dir.rglob(".DS_Store"):
-        try: ds.unlink()
-        except: pass
-    # Create ZIP as .pkpass with relative file paths
-    with ZipFile(out_path, "w", ZIP_DEFLATED) as zf:
-        for p in sorted(build_dir.rglob("*")):
-            if p.is_dir(): continue
-            rel = p.relative_to(build_dir)
-            # Don't include hidden files that aren't required
-            if rel.name.startswith("."): continue
-            zf.write(p, arcname=str(rel))
-    print(f"Created file: {out_path}")
-    # Print contents
-    with ZipFile(out_path, "r") as zf:
-        print("pkpass contents:")
-        for zi in zf.infolist():
-            print("  ", zi.filename)
-
+    manifest = {}
+    # One read buffer per archive (builds run concurrently), reused for every file
+    buf = memoryview(bytearray(COPY_CHUNK_SIZE))
+    with open(out_path, "wb", buffering=ARCHIVE_BUFFER_SIZE) as out, ZipFile(out, "w", ZIP_DEFLATED) as zf:
+        for rel, src in entries:
+            if isinstance(src, bytes):
+                hasher = _sha1()
+                hasher.update(src)
+                manifest[rel] = hasher.hexdigest()
+                zf.writestr(_zip_entry(rel), src)
+                continue
+            st = src.stat()
+            manifest[rel] = _cached_sha1(str(src.resolve()), st.st_mtime_ns, st.st_size)
+            # Reads are already chunk-sized, so skip the extra buffer copy
+            with open(src, "rb", buffering=0) as fin, zf.open(_zip_entry(rel), "w") as fout:
+                while n := fin.readinto(buf):
+                    fout.write(buf[:n])
+        if not manifest:
+            raise SystemExit(" manifest.json is empty — check that pass.json and icon.png exist in the project directory.")
+        manifest_bytes = json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8")
+        zf.writestr(_zip_entry("manifest.json"), manifest_bytes)
+        zf.writestr(_zip_entry("signature"), sign(manifest_bytes))
+    logger.debug("manifest.json created (%d items)", len(manifest))
+    logger.debug("Created file: %s", out_path)
+    return out_path
 
 class PKPassCreator:
     """Creates PKPass files from JSON data using OpenSSL and environment variables."""
@@ -221,8 +310,46 @@ class PKPassCreator:
         if not Path(self.wwdr_cert_path).exists():
             raise ValueError(f" WWDR certificate file not found: {self.wwdr_cert_path}")
         
-        print(f" Certificate: {self.cert_path}")
-        print(f" WWDR Certificate: {self.wwdr_cert_path}")
+        logger.debug(" Certificate: %s", self.cert_path)
+        logger.debug(" WWDR Certificate: %s", self.wwdr_cert_path)
+        
+        # Unpack the P12 once; every pass reuses the same signer
+        if HAS_CRYPTOGRAPHY:
+            # Single in-process parse, including the PBKDF2 key derivation
+            self.signer_key, self.signer_cert, _ = pkcs12.load_key_and_certificates(
+                Path(self.cert_path).read_bytes(), self.cert_password.encode()
+            )
+            self.wwdr_cert = x509.load_pem_x509_certificate(Path(self.wwdr_cert_path).read_bytes())
+        else:
+            self._pem_dir = tempfile.mkdtemp(prefix="pkpass_signer_")
+            atexit.register(shutil.rmtree, self._pem_dir, ignore_errors=True)
+            self.signer_cert_pem = Path(self._pem_dir) / "signerCert.pem"
+            self.signer_key_pem = Path(self._pem_dir) / "signerKey.pem"
+            self._extract_signer_pems()
+    
+    def _extract_signer_pems(self):
+        """Write the signer certificate and unencrypted key from the P12 to PEM files."""
+        for extra_args, out_path in (
+            (["-clcerts", "-nokeys"], self.signer_cert_pem),
+            (["-nocerts", "-nodes"], self.signer_key_pem),
+        ):
+            cmd = ["openssl", "pkcs12", "-passin", f"pass:{self.cert_password}",
+                   "-in", str(self.cert_path), *extra_args, "-out", str(out_path)]
+            try:
+                run(cmd)
+            except SystemExit:
+                # If command failed, try with -legacy flag for OpenSSL 3.x compatibility
+                logger.warning(" OpenSSL command failed, retrying with -legacy flag...")
+                run(cmd[:2] + ["-legacy"] + cmd[2:])
+    
+    def _sign(self, manifest: bytes, build_dir: Path) -> bytes:
+        """Return the detached DER signature for manifest bytes."""
+        if HAS_CRYPTOGRAPHY:
+            return sign_manifest_in_process(manifest, self.signer_cert, self.signer_key, self.wwdr_cert)
+        # The openssl CLI works on files
+        (build_dir / "manifest.json").write_bytes(manifest)
+        sig_path = sign_manifest(build_dir, self.signer_cert_pem, self.signer_key_pem, Path(self.wwdr_cert_path))
+        return sig_path.read_bytes()
     
     def generate_pkpass(self, json_file: str, output_dir: Optional[str] = None, assets_dir: Optional[str] = None) -> str:
         """Generate a .pkpass file from JSON input.
@@ -242,19 +369,32 @@ class PKPassCreator:
         # Load and validate pass data
         pass_data = load_pass_json(json_path)
         
-        # Determine output path
-        if output_dir is None:
-            output_dir = json_path.parent
-        else:
-            output_dir = Path(output_dir)
+        return self.generate_pkpass_from_dict(
+            pass_data, output_dir if output_dir is not None else json_path.parent, assets_dir
+        )
+    
+    def generate_pkpass_from_dict(self, pass_data: Dict[str, Any], output_dir: str,
+                                  assets_dir: Optional[str] = None) -> str:
+        """Generate a .pkpass file from pass data already in memory.
+        
+        Args:
+            pass_data: Apple Wallet pass dictionary
+            output_dir: Directory to save the .pkpass file
+            assets_dir: Directory containing icon and other assets (optional)
+        
+        Returns:
+            Path to the generated .pkpass file
+        """
+        check_required_keys(pass_data)
         
+        output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
         
         # Generate output filename
         serial_number = pass_data.get('serialNumber', 'UNKNOWN')
         output_file = output_dir / f"{serial_number}.pkpass"
         
-        print(f" Generating PKPass: {output_file}")
+        logger.debug(" Generating PKPass: %s", output_file)
         
         # Determine assets directory
         if assets_dir:
@@ -269,58 +409,21 @@ class PKPassCreator:
             if not (assets_path / asset).exists():
                 raise ValueError(f"Required asset missing: {asset} in {assets_path}")
         
-        # Create build directory
+        # Pass files are zipped straight from their sources; the build
+        # directory only holds the openssl signing files, if any
         with tempfile.TemporaryDirectory() as temp_dir:
             build_dir = Path(temp_dir) / "build_pkpass"
             build_dir.mkdir(parents=True, exist_ok=True)
             
-            # Copy pass.json to build directory
-            shutil.copy2(json_path, build_dir / 'pass.json')
-            
-            # Copy assets to build directory
-            copy_inputs_to_build(build_dir, assets_path)
-            
-            # Extract PEMs from P12 in temp directory
-            signer_cert_pem = Path(temp_dir) / "signerCert.pem"
-            signer_key_pem = Path(temp_dir) / "signerKey.pem"
-            
-            # Extract certificate (public key) - try without -legacy first, then with if needed
-            cert_cmd = ["openssl", "pkcs12", "-passin", f"pass:{self.cert_password}", 
-                       "-in", str(self.cert_path), "-clcerts", "-nokeys", "-out", str(signer_cert_pem)]
-            
-            try:
-                run(cert_cmd)
-            except SystemExit:
-                # If command failed, try with -legacy flag for OpenSSL 3.x compatibility
-                print(" OpenSSL command failed, retrying with -legacy flag...")
-                cert_cmd_legacy = ["openssl", "pkcs12", "-legacy", "-passin", f"pass:{self.cert_password}",
-                                  "-in", str(self.cert_path), "-clcerts", "-nokeys", "-out", str(signer_cert_pem)]
-                run(cert_cmd_legacy)
-            
-            # Extract private key (without password protection) - try without -legacy first, then with if needed
-            key_cmd = ["openssl", "pkcs12", "-passin", f"pass:{self.cert_password}",
-                      "-in", str(self.cert_path), "-nocerts", "-nodes", "-out", str(signer_key_pem)]
-            
-            try:
-                run(key_cmd)
-            except SystemExit:
-                # If command failed, try with -legacy flag for OpenSSL 3.x compatibility
-                print(" OpenSSL command failed, retrying with -legacy flag...")
-                key_cmd_legacy = ["openssl", "pkcs12", "-legacy", "-passin", f"pass:{self.cert_password}",
-                                 "-in", str(self.cert_path), "-nocerts", "-nodes", "-out", str(signer_key_pem)]
-                run(key_cmd_legacy)
-            
-            # Create manifest
-            build_manifest(build_dir)
-
-            # Sign manifest
-            sign_manifest(build_dir, signer_cert_pem, signer_key_pem, Path(self.wwdr_cert_path))
+            # Serialized once; the same bytes are hashed and zipped, never written to disk
+            entries = collect_pass_inputs(_json_dumps(pass_data), assets_path)
             
-            # Create final .pkpass file
-            zip_pkpass(build_dir, output_file)
+            # Hash, sign and zip in a single pass over the sources
+            build_and_zip(entries, output_file, lambda manifest: self._sign(manifest, build_dir))
             
-            print(f" PKPass created successfully: {output_file}")
-            print(f" File size: {output_file.stat().st_size} bytes")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(" PKPass created successfully: %s", output_file)
+                logger.debug(" File size: %d bytes", output_file.stat().st_size)
             
             return str(output_file)
 
@@ -332,6 +435,7 @@ def main():
     ap.add_argument("--output", "-o", help="Output .pkpass file path")
     ap.add_argument("--assets-dir", help="Directory containing icon and other assets")
     args = ap.parse_args()
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s")
     
     # Check for pass.json in current directory first
     json_file = args.json_file
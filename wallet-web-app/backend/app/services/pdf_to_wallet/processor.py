@@ -6,9 +6,9 @@ A processing pipeline that uses regex with LLM m.
 import asyncio
 import logging
 import os
-import subprocess
-from pathlib import Path
-from typing import Dict, List
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 
 from models import TicketData
 from pdf_processor import PDFProcessor
@@ -17,6 +17,7 @@ from field_parser import FieldParser
 from pass_builder import PassBuilder
 from llm_mapper import LLMMapper
 from llm_processor import LLMProcessor
+from pkpass_creator import PKPassCreator
 from response_json_to_pkpass_json import process_llm_data_to_wallet_passes
 
 logger = logging.getLogger(__name__)
@@ -32,6 +33,8 @@ class WalletPassProcessor:
         self.pass_builder = PassBuilder()
         self.llm_mapper = LLMMapper()
         self.llm_processor = LLMProcessor()
+        # Certificates are only needed once a .pkpass is requested
+        self._pkpass_creator: Optional[PKPassCreator] = None
     
     def _extract_with_full_llm(self, pdf_path: str, organization: str, 
                               pass_type_id: str, team_id: str,
@@ -72,6 +75,15 @@ class WalletPassProcessor:
             logger.error(f"❌ Vision API extraction failed: {e}")
             return None
 
+    def _get_pkpass_creator(self) -> Optional[PKPassCreator]:
+        """Return the shared PKPassCreator, creating it on first use."""
+        if self._pkpass_creator is None:
+            try:
+                self._pkpass_creator = PKPassCreator()
+            except (ValueError, SystemExit) as e:
+                logger.error(f"❌ PKPass creator not configured: {e}")
+        return self._pkpass_creator
+
     def _create_pkpass_files(self, wallet_passes: List[Dict]) -> List[str]:
         """
         Create .pkpass files from Apple Wallet JSON data
@@ -82,72 +94,37 @@ class WalletPassProcessor:
         Returns:
             List of created .pkpass file paths
         """
-        created_files = []
+        creator = self._get_pkpass_creator()
+        if creator is None:
+            return []
         
+        # Passes are independent, and signing, zlib and file I/O release the GIL.
+        # A fresh directory per call, with one subdirectory per pass, so neither
+        # concurrent requests nor passes sharing a serial write the same file.
+        total = len(wallet_passes)
+        output_dir = tempfile.mkdtemp(prefix="pkpass_")
+        with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as executor:
+            results = executor.map(
+                lambda item: self._build_one_pkpass(creator, item[0], total, item[1], output_dir),
+                enumerate(wallet_passes, 1)
+            )
+            return [pkpass_file for pkpass_file in results if pkpass_file]
+    
+    def _build_one_pkpass(self, creator: PKPassCreator, i: int, total: int,
+                          pass_data: Dict, output_dir: str) -> Optional[str]:
+        """Build a single .pkpass file; returns its path, or None on failure."""
         try:
-            import json
-            import tempfile
-            
-            for i, pass_data in enumerate(wallet_passes, 1):
-                try:
-                    # Create temporary JSON file
-                    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as temp_file:
-                        json.dump(pass_data, temp_file, indent=2)
-                        temp_json_path = temp_file.name
-                    
-                    # Run pkpass_creator on the JSON file
-                    logger.info(f"🔧 Creating .pkpass file {i}/{len(wallet_passes)}...")
-                    
-                    # Get the current directory for pkpass_creator.py
-                    current_dir = Path(__file__).parent
-                    pkpass_creator_path = current_dir / "pkpass_creator.py"
-                    
-                    if not pkpass_creator_path.exists():
-                        logger.error(f"pkpass_creator.py not found at {pkpass_creator_path}")
-                        continue
-                    
-                    # Run pkpass_creator as subprocess
-                    result = subprocess.run(
-                        ["python", str(pkpass_creator_path), temp_json_path],
-                        cwd=str(current_dir),
-                        capture_output=True,
-                        text=True
-                    )
-                    
-                    if result.returncode == 0:
-                        # Parse the output to find the created .pkpass file path
-                        output_lines = result.stdout.split('\n')
-                        pkpass_file = None
-                        
-                        for line in output_lines:
-                            if line.strip().endswith('.pkpass'):
-                                pkpass_file = line.strip()
-                                break
-                        
-                        if pkpass_file:
-                            created_files.append(pkpass_file)
-                            logger.info(f"✅ Created: {pkpass_file}")
-                        else:
-                            logger.warning(f"⚠️ .pkpass file created but path not found in output")
-                    else:
-                        logger.error(f"❌ pkpass_creator failed for pass {i}: {result.stderr}")
-                    
-                    # Clean up temporary file
-                    try:
-                        os.unlink(temp_json_path)
-                    except:
-                        pass
-                        
-                except Exception as e:
-                    logger.error(f"❌ Failed to create .pkpass file for pass {i}: {e}")
-                    continue
+            logger.info(f"🔧 Creating .pkpass file {i}/{total}...")
             
-            return created_files
+            # Build in-process straight from the dict; the pkpass helpers signal failure with SystemExit
+            pkpass_file = creator.generate_pkpass_from_dict(pass_data, output_dir=os.path.join(output_dir, str(i)))
+            logger.info(f"✅ Created: {pkpass_file}")
+            return pkpass_file
             
-        except Exception as e:
-            logger.error(f"❌ Failed to create .pkpass files: {e}")
-            return []
-
+        except (Exception, SystemExit) as e:
+            logger.error(f"❌ Failed to create .pkpass file for pass {i}: {e}")
+            return None
+    
     def process_pdf_traditional(self, pdf_path: str, organization: str, pass_type_id: str, 
                                team_id: str, pass_type: str = None, timezone: str = "+00:00",
                                use_llm: bool = True, api_key_env: str = "OPENAI_API_KEY") -> List[Dict]:
@@ -8,7 +8,7 @@ import json
 import logging
 import os
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 
 from category_processors import (
     EventTicketProcessor,
@@ -19,6 +19,75 @@ from category_processors import (
 
 logger = logging.getLogger(__name__)
 
+# Faster JSON output when available; both return UTF-8 bytes
+try:
+    import orjson
+
+    def _dumps_pretty(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _dumps_pretty(obj) -> bytes:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+# Identifier-like ticket fields the LLM may return as numbers; pass fields need strings
+_STRING_TICKET_FIELDS = (
+    'ticket_id', 'order_id', 'reservation_code', 'barcode_message',
+    'section', 'row', 'seat', 'zone', 'gate'
+)
+_STRING_BOARDING_FIELDS = ('flight_number', 'gate', 'seat', 'pnr')
+
+# LLM categories: ["Boarding pass","Coupon","Event ticket","Store card","Generic"]
+_CATEGORY_PROCESSORS = {
+    "Event ticket": (EventTicketProcessor, "process_event_tickets"),
+    "Boarding pass": (BoardingPassProcessor, "process_boarding_passes"),
+    "Store card": (StoreCardProcessor, "process_store_cards"),
+    "Coupon": (StoreCardProcessor, "process_store_cards"),
+    "Generic": (GenericTicketProcessor, "process_generic_tickets"),
+}
+
+def _coerce_fields_to_str(data: Dict[str, Any], keys: tuple) -> None:
+    """Convert numeric values of the given keys to strings in place."""
+    for key in keys:
+        value = data.get(key)
+        if value is not None and not isinstance(value, str):
+            data[key] = str(value)
+
+
+def _normalize_tickets(tickets: List[Dict[str, Any]]) -> None:
+    """Coerce identifier fields to strings once so processors can use them directly."""
+    for ticket in tickets:
+        _coerce_fields_to_str(ticket, _STRING_TICKET_FIELDS)
+        boarding_data = (ticket.get('category_specific') or {}).get('boarding_pass')
+        if boarding_data:
+            _coerce_fields_to_str(boarding_data, _STRING_BOARDING_FIELDS)
+
+
+def _save_pass(output_path: Path, i: int, total: int, pass_data: Dict[str, Any],
+               make_dir: bool = True) -> Optional[str]:
+    """Save one pass as <output_path>/<i>/pass.json; returns the file path, or None on failure."""
+    try:
+        # Create a subdirectory for each pass, unless it is known to exist already
+        pass_dir = output_path / str(i)
+        if make_dir:
+            pass_dir.mkdir(exist_ok=True)
+        
+        # Save the pass as a single JSON object (not array)
+        pass_file = pass_dir / "pass.json"
+        
+        pass_file.write_bytes(_dumps_pretty(pass_data))
+        
+        # Log details about the saved pass
+        description = pass_data.get('description', 'Unknown')
+        serial = pass_data.get('serialNumber', 'N/A')
+        logger.info("💾 Pass %d/%d: %s → %s", i, total, description, pass_file)
+        logger.info("   Serial: %s", serial)
+        
+        return str(pass_file)
+        
+    except Exception as e:
+        logger.error("❌ Failed to save pass %d: %s", i, e)
+        return None
+
 
 def process_llm_data_to_wallet_passes(llm_data: Dict[str, Any], organization: str, 
                                     pass_type_id: str, team_id: str, 
@@ -37,78 +106,53 @@ def process_llm_data_to_wallet_passes(llm_data: Dict[str, Any], organization: st
     Returns:
         List of Apple Wallet pass JSON objects
     """
-    import os
-    from pathlib import Path
+    logger.info(" Processing LLM data with category: %s", llm_data.get('category', 'Unknown'))
     
-    logger.info(f" Processing LLM data with category: {llm_data.get('category', 'Unknown')}")
-    
-    # Extract category and tickets from LLM data
-    category = llm_data.get('category', '').strip()
+    # Extract tickets from LLM data; nothing else is needed when there are none
     tickets = llm_data.get('tickets', [])
     
     if not tickets:
         logger.warning("No tickets found in LLM data")
         return []
     
-    # Route to appropriate processor based on LLM category
-    # LLM categories: ["Boarding pass","Coupon","Event ticket","Store card","Generic"]
-    if category == "Event ticket":
-        processor = EventTicketProcessor(organization, pass_type_id, team_id)
-        passes = processor.process_event_tickets(tickets, llm_data)
-    elif category == "Boarding pass":
-        processor = BoardingPassProcessor(organization, pass_type_id, team_id)
-        passes = processor.process_boarding_passes(tickets, llm_data)
-    elif category in ["Store card", "Coupon"]:
-        processor = StoreCardProcessor(organization, pass_type_id, team_id)
-        passes = processor.process_store_cards(tickets, llm_data)
-    elif category == "Generic":
-        processor = GenericTicketProcessor(organization, pass_type_id, team_id)
-        passes = processor.process_generic_tickets(tickets, llm_data)
-    else:
+    category = llm_data.get('category', '').strip()
+    _normalize_tickets(tickets)
+    
+    # Route to appropriate processor based on LLM category; only that one is instantiated
+    route = _CATEGORY_PROCESSORS.get(category)
+    if route is None:
         # Fallback for unknown categories or legacy support
-        logger.warning(f"Unknown category '{category}', using generic processor")
-        processor = GenericTicketProcessor(organization, pass_type_id, team_id)
-        passes = processor.process_generic_tickets(tickets, llm_data)
+        logger.warning("Unknown category '%s', using generic processor", category)
+        route = _CATEGORY_PROCESSORS["Generic"]
+    processor_cls, method_name = route
+    processor = processor_cls(organization, pass_type_id, team_id)
+    passes = getattr(processor, method_name)(tickets, llm_data)
     
-    logger.info(f"✅ Generated {len(passes)} Apple Wallet pass(es)")
+    logger.info("✅ Generated %d Apple Wallet pass(es)", len(passes))
     
     # Always save tickets as separate files
     if len(passes) >= 1:
         # Create output directory if it doesn't exist
         output_path = Path(output_dir)
-        output_path.mkdir(exist_ok=True)
-        
-        saved_files = []
+        try:
+            output_path.mkdir()
+            existing_dirs = set()
+        except FileExistsError:
+            # One listing up front instead of a mkdir attempt per pass
+            with os.scandir(output_path) as it:
+                existing_dirs = {entry.name for entry in it if entry.is_dir()}
         
         if len(passes) > 1:
-            logger.info(f" Multiple tickets detected ({len(passes)}), saving each as separate JSON file...")
+            logger.info(" Multiple tickets detected (%d), saving each as separate JSON file...", len(passes))
         else:
-            logger.info(f" Single ticket detected, saving as JSON file...")
+            logger.info(" Single ticket detected, saving as JSON file...")
         
+        saved_count = 0
         for i, pass_data in enumerate(passes, 1):
-            try:
-                # Create a subdirectory for each pass
-                pass_dir = output_path / str(i)
-                pass_dir.mkdir(exist_ok=True)
-                
-                # Save the pass as a single JSON object (not array)
-                pass_file = pass_dir / "pass.json"
-                
-                with open(pass_file, 'w', encoding='utf-8') as f:
-                    json.dump(pass_data, f, indent=2, ensure_ascii=False)
-                
-                saved_files.append(str(pass_file))
-                
-                # Log details about the saved pass
-                description = pass_data.get('description', 'Unknown')
-                serial = pass_data.get('serialNumber', 'N/A')
-                logger.info(f"💾 Pass {i}/{len(passes)}: {description} → {pass_file}")
-                logger.info(f"   Serial: {serial}")
-                
-            except Exception as e:
-                logger.error(f"❌ Failed to save pass {i}: {e}")
-                continue
+            if _save_pass(output_path, i, len(passes), pass_data,
+                          make_dir=str(i) not in existing_dirs):
+                saved_count += 1
         
-        logger.info(f"✅ Successfully saved {len(saved_files)} pass file(s) to {output_path.absolute()}")
+        logger.info("✅ Successfully saved %d pass file(s) to %s", saved_count, output_path.absolute())
     
     return passes
@@ -10,22 +10,20 @@ import os
 import sys
 from pathlib import Path
 
-# Load environment variables from .env file
-try:
-    from dotenv import load_dotenv
-    # Look for .env file in the project root (4 levels up from run_tests.py)
-    env_path = Path(__file__).parent.parent.parent.parent.parent / '.env'
-    if env_path.exists():
-        load_dotenv(env_path)
-        print(f"✅ Loaded environment variables from: {env_path}")
-    else:
-        print("⚠️  .env file not found, using system environment variables")
-except ImportError:
-    print("⚠️  python-dotenv not available, using system environment variables")
-
-# Add current directory to path
+# Run as a script, so this directory is already first on sys.path
+# (under pytest, conftest.py puts it there)
 current_dir = Path(__file__).parent
-sys.path.insert(0, str(current_dir))
+
+from _paths import ENV_PATH
+from utils import find_pdf_files, load_env_once
+
+# Load environment variables from the .env file in the project root;
+# parsed once per process, however many modules ask for it
+if ENV_PATH.exists():
+    load_env_once(str(ENV_PATH))
+    print(f"✅ Loaded environment variables from: {ENV_PATH}")
+else:
+    print("⚠️  .env file not found, using system environment variables")
 
 def main():
     """Generate wallet passes from test PDFs"""
@@ -38,7 +36,7 @@ def main():
         print("❌ Test_files directory not found!")
         return 1
     
-    pdf_files = list(test_files_dir.glob("*.pdf"))
+    pdf_files = find_pdf_files(str(test_files_dir))
     print(f"📄 Found {len(pdf_files)} PDF test files:")
     for pdf_file in pdf_files:
         print(f"  - {pdf_file.name}")
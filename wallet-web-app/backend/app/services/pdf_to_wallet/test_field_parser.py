@@ -0,0 +1,69 @@
+"""
+Tests for FieldParser candidate extraction and pass type scoring.
+
+Expected candidate values are the outputs of the original per-pattern
+findall implementation; overlapping patterns must each keep reporting
+their match.
+"""
+
+import pytest
+
+import field_parser
+from field_parser import FieldParser, _score_pass_types
+
+
+@pytest.mark.parametrize("text, expected", [
+    (
+        "Mon 12/05/2024 Tue 5 May 2024",
+        (['12/05/2024', 'May', 'Mon'], ['2024', '2024'], [])
+    ),
+    (
+        "Flight LY315 on 12/05/2024 at 10:30, fare $450.00",
+        (['12/05/2024', '10:30'], ['2024', '450', '$450.00'], ['Flight', 'LY315'])
+    ),
+    (
+        "תאריך: 12/05/2024 שעה 20:00",
+        (['12/05/2024', 'תאריך: 12/05/2024', '20:00'], ['2024'], [])
+    ),
+    (
+        "Event on 25/12/2024 at 19:30. Seat 12A, Row 5. Booking: ABC123",
+        (['25/12/2024', '19:30'], ['2024', '12A'], ['Booking', 'ABC123', 'ABC123'])
+    ),
+    (
+        "",
+        ([], [], [])
+    ),
+])
+def test_parse_candidates_matches_baseline(text, expected):
+    assert FieldParser.parse_candidates(text) == expected
+
+
+@pytest.mark.parametrize("content, expected", [
+    (
+        "boarding pass flight ly315 gate b4 seat assignment 12a",
+        {"boardingPass": 4, "eventTicket": 1, "coupon": 0, "storeCard": 0}
+    ),
+    (
+        "concert ticket, row 5 seat 12. show starts 20:00. ticket ticket",
+        {"boardingPass": 0, "eventTicket": 5, "coupon": 0, "storeCard": 0}
+    ),
+    (
+        "club member since 2020, points balance 300. 20% off coupon expires",
+        {"boardingPass": 0, "eventTicket": 0, "coupon": 3, "storeCard": 5}
+    ),
+    (
+        "כרטיס טיסה שער 5 מושב 12",
+        {"boardingPass": 3, "eventTicket": 2, "coupon": 0, "storeCard": 0}
+    ),
+    (
+        "",
+        {"boardingPass": 0, "eventTicket": 0, "coupon": 0, "storeCard": 0}
+    ),
+])
+@pytest.mark.parametrize("use_automaton", [True, False])
+def test_score_pass_types_counts_each_keyword_once(content, expected, use_automaton, monkeypatch):
+    if use_automaton:
+        pytest.importorskip("ahocorasick")
+    monkeypatch.setattr(field_parser, "HAS_AHOCORASICK", use_automaton)
+
+    assert _score_pass_types(content) == expected
@@ -7,46 +7,32 @@ PDF → LLM Vision API → Apple Wallet JSON → .pkpass files
 This test will convince you that processor.py fully works!
 """
 
-import sys
 import os
 import json
 import logging
-from pathlib import Path
 import tempfile
 import time
+import traceback
 from processor import WalletPassProcessor        
-
-# Add the current directory to Python path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _paths import ENV_PATH
+from utils import load_env_once
 
 # Load environment variables from the main .env file
 def load_env_file():
     """Load environment variables from the main .env file"""
     try:
-        # Find the .env file in the wallet-web-app directory
-        current_dir = Path(__file__).parent
-        env_file_path = None
-        
-        # Search upwards for the .env file
-        for parent in current_dir.parents:
-            potential_env = parent / ".env"
-            if potential_env.exists():
-                env_file_path = potential_env
-                break
+        # The .env file lives in the wallet-web-app directory
+        env_file_path = ENV_PATH
         
-        if env_file_path:
+        if env_file_path.exists():
             print(f"📋 Loading environment from: {env_file_path}")
-            with open(env_file_path, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#') and '=' in line:
-                        key, value = line.split('=', 1)
-                        os.environ[key] = value
+            load_env_once(str(env_file_path))
             print(f"✅ Environment variables loaded successfully")
             
             # Check if OpenAI API key is loaded
-            if 'OPENAI_API_KEY' in os.environ:
-                print(f"✅ OpenAI API key found (length: {len(os.environ['OPENAI_API_KEY'])})")
+            api_key = os.environ.get('OPENAI_API_KEY')
+            if api_key is not None:
+                print(f"✅ OpenAI API key found (length: {len(api_key)})")
                 return True
             else:
                 print(f"❌ OpenAI API key not found in environment")
@@ -62,6 +48,9 @@ def load_env_file():
 # Load environment variables before importing other modules
 env_loaded = load_env_file()
 
+# Read once; the test only needs to know whether a key is configured
+_OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY', '')
+
 # Set up comprehensive logging
 logging.basicConfig(
     level=logging.INFO, 
@@ -69,15 +58,15 @@ logging.basicConfig(
     datefmt='%H:%M:%S'
 )
 
-def test_complete_pipeline():
+def test_complete_pipeline(processor: WalletPassProcessor):
     """
     Test the complete pipeline using processor.py process_pdf() method
     This tests the entire end-to-end pipeline from PDF input to .pkpass files
+    
+    Under pytest, processor is the session-wide instance from conftest.py
     """
     print("TESTING COMPLETE PIPELINE WITH PROCESSOR.PROCESS_PDF()")
     try:
-        # Import and initialize processor
-        processor = WalletPassProcessor()        
         # Test configuration
         test_pdf = "Test_files/boarding_pass.pdf"
         organization = "Tapass"
@@ -98,8 +87,7 @@ def test_complete_pipeline():
         print(f"✅ Test PDF file exists")
         
         # Check if API key is available
-        has_api_key = 'OPENAI_API_KEY' in os.environ and os.environ['OPENAI_API_KEY']
-        if has_api_key:
+        if _OPENAI_API_KEY:
             print(f"✅ OpenAI API key available - will use real LLM")
         else:
             print(f"⚠️  No OpenAI API key - processor may fall back to test data")
@@ -161,15 +149,17 @@ def test_complete_pipeline():
             return False
             
     except Exception as e:
-        print(f"❌ CRITICAL ERROR: {e}")
-        import traceback
-        traceback.print_exc()
+        # Short form by default; the full stack only when asked for
+        short = ''.join(traceback.format_exception_only(type(e), e)).rstrip()
+        print(f"❌ CRITICAL ERROR: {short}")
+        if os.environ.get('TAPASS_VERBOSE'):
+            traceback.print_exc()
         return False
 
 if __name__ == "__main__":
     print("=" * 80)
     # Run all tests
-    test_success = test_complete_pipeline()
+    test_success = test_complete_pipeline(WalletPassProcessor())
     # Final verdict
     print(f"=" * 80)
     print(f"Pipeline Test:     {'✅ PASS' if test_success else '❌ FAIL'}")
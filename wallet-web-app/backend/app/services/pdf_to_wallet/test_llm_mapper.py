@@ -0,0 +1,107 @@
+"""
+Tests for rate limiting and streamed-completion handling in llm_mapper.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from aiolimiter import AsyncLimiter
+
+from llm_mapper import LLMMapper, _read_json_stream
+from models import TicketData
+
+
+def test_rate_limit_takes_one_request_and_the_estimated_tokens(monkeypatch):
+    monkeypatch.setattr(LLMMapper, "_request_limiter", AsyncLimiter(1, 60))
+    monkeypatch.setattr(LLMMapper, "_token_limiter", AsyncLimiter(3000, 60))
+
+
+    async def acquire_and_check():
+        await LLMMapper._acquire_rate_limit(2000)
+        return (
+            LLMMapper._request_limiter.has_capacity(1),
+            LLMMapper._token_limiter.has_capacity(1000),
+            LLMMapper._token_limiter.has_capacity(1500)
+        )
+
+    assert asyncio.run(acquire_and_check()) == (False, True, False)
+
+
+def test_mapping_acquires_its_estimated_token_count(monkeypatch):
+    acquired = []
+
+    async def acquire(estimated_tokens):
+        acquired.append(estimated_tokens)
+        raise RuntimeError("stop before the request")
+
+    monkeypatch.setattr(LLMMapper, "_acquire_rate_limit", staticmethod(acquire))
+    raw_text = "x" * 4000
+
+    result = asyncio.run(LLMMapper()._map_with_openai("sk-test", TicketData(raw_text=raw_text), raw_text))
+
+    assert result is None
+    # ~4 characters per prompt token, plus 1000 for the response
+    assert acquired == [2000]
+
+
+class _FakeStream:
+    """Async iterator of completion chunks that records how much was consumed."""
+
+    def __init__(self, deltas):
+        self._chunks = [
+            SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=delta))])
+            if delta is not ... else SimpleNamespace(choices=[])
+            for delta in deltas
+        ]
+        self.consumed = 0
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.closed or self.consumed == len(self._chunks):
+            raise StopAsyncIteration
+        self.consumed += 1
+        return self._chunks[self.consumed - 1]
+
+    async def close(self):
+        self.closed = True
+
+
+def _read(stream):
+    return asyncio.run(_read_json_stream(stream))
+
+
+def test_stops_at_the_closing_brace():
+    stream = _FakeStream(['{"a": ', '{"b": 1}', '}', ' trailing', ' tokens'])
+
+    assert _read(stream) == '{"a": {"b": 1}}'
+    assert stream.closed
+    assert stream.consumed == 3
+
+
+def test_closing_brace_mid_chunk_drops_the_rest_of_the_chunk():
+    stream = _FakeStream(['{"a": 1} extra'])
+
+    assert _read(stream) == '{"a": 1}'
+
+
+def test_braces_and_escaped_quotes_inside_strings_are_ignored():
+    stream = _FakeStream(['{"a": "}{ \\" }', '", "b": "\\\\"}', ' more'])
+
+    assert _read(stream) == '{"a": "}{ \\" }", "b": "\\\\"}'
+    assert stream.closed
+
+
+def test_empty_chunks_and_leading_text_are_tolerated():
+    stream = _FakeStream([..., None, '', 'Here you go: {"a"', ': 1}'])
+
+    assert _read(stream) == 'Here you go: {"a": 1}'
+
+
+def test_returns_everything_when_no_object_completes():
+    stream = _FakeStream(['{"a": ', '[1, 2'])
+
+    assert _read(stream) == '{"a": [1, 2'
+    assert not stream.closed
@@ -0,0 +1,151 @@
+"""
+Tests for LLMProcessor.
+"""
+
+import asyncio
+from collections import OrderedDict
+
+import fitz
+
+import llm_processor
+from llm_processor import (
+    LLMProcessor,
+    VISION_BATCH_RESPONSE_FORMAT,
+    VISION_BATCH_SIZE,
+    VISION_MAX_OUTPUT_TOKENS,
+    VISION_RESPONSE_FORMAT,
+    _strict_schema
+)
+
+
+def test_large_batch_is_split_within_the_output_limit(fake_openai, make_pdf):
+    pdfs = [make_pdf(f"Batch ticket {i}") for i in range(VISION_BATCH_SIZE * 2 + 1)]
+
+    results = asyncio.run(LLMProcessor().process_pdfs_with_vision(pdfs))
+
+    assert all(result is not None for result in results)
+    assert len(fake_openai.requests) == 3
+    assert all(request["max_tokens"] <= VISION_MAX_OUTPUT_TOKENS for request in fake_openai.requests)
+
+
+def _text_heavy_pdf(path, with_vector_barcode):
+    """One page of plain text well past TEXT_ONLY_CHARS, optionally with a vector-drawn 2D code."""
+    with fitz.open() as doc:
+        page = doc.new_page()
+        page.insert_textbox(fitz.Rect(36, 36, 576, 500), "Admit one. Terms and conditions apply. " * 40, fontsize=8)
+        if with_vector_barcode:
+            shape = page.new_shape()
+            for row in range(21):
+                for col in range(21):
+                    if (row * 7 + col * 3) % 5 < 2:
+                        shape.draw_rect(fitz.Rect(400 + col * 4, 600 + row * 4, 404 + col * 4, 604 + row * 4))
+            shape.finish(fill=(0, 0, 0), color=None)
+            shape.commit()
+        doc.save(str(path))
+    return str(path)
+
+
+def test_text_heavy_page_is_sent_as_text(tmp_path):
+    parts = LLMProcessor().pdf_to_images(_text_heavy_pdf(tmp_path / "text.pdf", with_vector_barcode=False))
+
+    assert [part["type"] for part in parts] == ["text"]
+
+
+def test_text_heavy_page_with_vector_barcode_is_sent_as_image(tmp_path):
+    parts = LLMProcessor().pdf_to_images(_text_heavy_pdf(tmp_path / "barcode.pdf", with_vector_barcode=True))
+
+    assert [part["type"] for part in parts] == ["image_url"]
+
+
+def _image_part(size):
+    return {"type": "image_url", "image_url": {"url": "x" * size, "detail": "high"}}
+
+
+def test_render_cache_is_bounded_by_encoded_size(monkeypatch):
+    monkeypatch.setattr(llm_processor, "RENDER_CACHE_MAX_BYTES", 1000)
+    monkeypatch.setattr(llm_processor, "_render_cache", OrderedDict())
+    monkeypatch.setattr(llm_processor, "_render_cache_sizes", {})
+    monkeypatch.setattr(llm_processor, "_render_cache_bytes", 0)
+
+    llm_processor._render_cache_put("a", [_image_part(400)])
+    llm_processor._render_cache_put("b", [_image_part(300), {"type": "text", "text": "y" * 100}])
+    llm_processor._render_cache_put("c", [_image_part(400)])
+    llm_processor._render_cache_put("too-big", [_image_part(1001)])
+
+    assert list(llm_processor._render_cache) == ["b", "c"]
+    assert llm_processor._render_cache_bytes == 800
+
+
+def test_strict_schema_lists_every_property_and_makes_nullable_objects_anyof():
+    schema = {
+        "type": "object",
+        "required": ["count"],
+        "properties": {
+            "count": {"type": "integer", "minimum": 0},
+            "score": {"type": "number", "minimum": 0.0, "maximum": 1.0},
+            "tags": {"type": ["array", "null"], "items": {"type": "string"}},
+            "price": {
+                "type": ["object", "null"],
+                "properties": {"amount": {"type": ["number", "null"]}}
+            },
+            "rows": {
+                "type": "array",
+                "items": {"type": "object", "properties": {"seat": {"type": ["string", "null"]}}}
+            }
+        }
+    }
+
+    assert _strict_schema(schema) == {
+        "type": "object",
+        "required": ["count", "score", "tags", "price", "rows"],
+        "additionalProperties": False,
+        "properties": {
+            "count": {"type": "integer"},
+            "score": {"type": "number"},
+            "tags": {"type": ["array", "null"], "items": {"type": "string"}},
+            "price": {"anyOf": [
+                {
+                    "type": "object",
+                    "required": ["amount"],
+                    "additionalProperties": False,
+                    "properties": {"amount": {"type": ["number", "null"]}}
+                },
+                {"type": "null"}
+            ]},
+            "rows": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "required": ["seat"],
+                    "additionalProperties": False,
+                    "properties": {"seat": {"type": ["string", "null"]}}
+                }
+            }
+        }
+    }
+    # The validation schema itself is left untouched
+    assert schema["required"] == ["count"]
+    assert schema["properties"]["count"] == {"type": "integer", "minimum": 0}
+
+
+def _objects(schema):
+    """Every object schema nested in a derived strict schema."""
+    for option in schema.get("anyOf", ()):
+        yield from _objects(option)
+    if "properties" in schema:
+        yield schema
+        for prop in schema["properties"].values():
+            yield from _objects(prop)
+    if "items" in schema:
+        yield from _objects(schema["items"])
+
+
+def test_vision_response_formats_satisfy_strict_mode():
+    for response_format in (VISION_RESPONSE_FORMAT, VISION_BATCH_RESPONSE_FORMAT):
+        objects = list(_objects(response_format["json_schema"]["schema"]))
+        assert objects
+        for obj in objects:
+            assert obj["required"] == list(obj["properties"])
+            assert obj["additionalProperties"] is False
+            assert obj["type"] == "object"
+        assert "minimum" not in repr(response_format) and "maximum" not in repr(response_format)
@@ -0,0 +1,44 @@
+"""
+Tests for WalletPassProcessor.
+"""
+
+import json
+from pathlib import Path
+
+from processor import WalletPassProcessor
+
+def test_process_pdf_twice_on_one_processor(fake_openai, make_pdf, tmp_path, monkeypatch):
+    """Each call runs on its own event loop; the second must not reuse the first loop's connections."""
+    # Pass JSON is saved under the working directory
+    monkeypatch.chdir(tmp_path)
+    processor = WalletPassProcessor()
+    pdfs = [make_pdf(f"Ticket number {i}") for i in range(2)]
+
+    for pdf in pdfs:
+        passes = processor.process_pdf(
+            pdf, "Test Org", "pass.com.example.test", "ABCDE12345", create_pkpass=False
+        )
+        assert len(passes) == 1
+
+    assert len(fake_openai.requests) == 2
+
+
+class _WritingCreator:
+    """Stands in for PKPassCreator, writing pass.json where the archive would go."""
+
+    def generate_pkpass_from_dict(self, pass_data, output_dir):
+        path = Path(output_dir) / f"{pass_data['serialNumber']}.pkpass"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(pass_data))
+        return str(path)
+
+
+def test_create_pkpass_files_keeps_passes_with_one_serial_apart():
+    processor = WalletPassProcessor()
+    processor._pkpass_creator = _WritingCreator()
+    passes = [{"serialNumber": "TICKET_1", "seat": str(seat)} for seat in range(4)]
+
+    files = processor._create_pkpass_files(passes)
+
+    assert len(set(files)) == len(passes)
+    assert sorted(json.loads(Path(f).read_text())["seat"] for f in files) == ["0", "1", "2", "3"]
@@ -0,0 +1,52 @@
+"""
+Tests for category routing and ticket normalization in response_json_to_pkpass_json.
+"""
+
+import pytest
+
+from response_json_to_pkpass_json import _normalize_tickets, process_llm_data_to_wallet_passes
+
+
+@pytest.mark.parametrize("category, style", [
+    ("Event ticket", "eventTicket"),
+    ("Boarding pass", "boardingPass"),
+    ("Store card", "storeCard"),
+    ("Coupon", "storeCard"),
+    ("Generic", "generic"),
+    # Anything outside the LLM category enum falls back to the generic processor
+    ("Train ticket", "generic"),
+    ("ticket for a flight", "generic"),
+    ("BOARDING PASS", "generic"),
+    ("", "generic"),
+])
+def test_categories_are_routed_by_exact_name(category, style, tmp_path):
+    llm_data = {"category": category, "tickets": [{"ticket_id": "1", "raw_title": "Show"}]}
+
+    passes = process_llm_data_to_wallet_passes(llm_data, "Org", "pass.com.example.test", "ABCDE12345", str(tmp_path))
+
+    assert len(passes) == 1
+    assert style in passes[0]
+
+
+def test_normalize_tickets_coerces_identifiers_to_strings():
+    tickets = [
+        {
+            "ticket_id": 12345, "order_id": None, "row": 7, "seat": "12A", "gate": 3.0,
+            "raw_title": "Show", "price": {"amount": 120.5},
+            "category_specific": {"boarding_pass": {"flight_number": 315, "seat": None, "carrier": "LY"}}
+        },
+        {"seat": 4, "category_specific": None},
+        {"barcode_message": 998877},
+    ]
+
+    _normalize_tickets(tickets)
+
+    assert tickets == [
+        {
+            "ticket_id": "12345", "order_id": None, "row": "7", "seat": "12A", "gate": "3.0",
+            "raw_title": "Show", "price": {"amount": 120.5},
+            "category_specific": {"boarding_pass": {"flight_number": "315", "seat": None, "carrier": "LY"}}
+        },
+        {"seat": "4", "category_specific": None},
+        {"barcode_message": "998877"},
+    ]
@@ -0,0 +1,72 @@
+"""
+Tests for the .env loader and pass saving in utils.
+"""
+
+import json
+import os
+
+from utils import FileUtils, load_env_once
+
+ENV_KEYS = ("TAPASS_TEST_PLAIN", "TAPASS_TEST_COMMENTED", "TAPASS_TEST_DQUOTED",
+            "TAPASS_TEST_SQUOTED", "TAPASS_TEST_HASH_IN_QUOTES", "TAPASS_TEST_EXPORTED",
+            "TAPASS_TEST_PRESET")
+
+
+def _write_env(tmp_path, monkeypatch, text):
+    for key in ENV_KEYS:
+        monkeypatch.delenv(key, raising=False)
+    path = tmp_path / ".env"
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_load_env_once_parses_like_dotenv(tmp_path, monkeypatch):
+    path = _write_env(tmp_path, monkeypatch, (
+        "# a comment line\n"
+        "\n"
+        "TAPASS_TEST_PLAIN=plain\n"
+        "TAPASS_TEST_COMMENTED=sk-abc # prod key\n"
+        'TAPASS_TEST_DQUOTED="double quoted"\n'
+        "TAPASS_TEST_SQUOTED='single quoted'\n"
+        'TAPASS_TEST_HASH_IN_QUOTES="a # b"\n'
+        "export TAPASS_TEST_EXPORTED=exported\n"
+    ))
+
+    values = load_env_once(path)
+
+    assert values == {
+        "TAPASS_TEST_PLAIN": "plain",
+        "TAPASS_TEST_COMMENTED": "sk-abc",
+        "TAPASS_TEST_DQUOTED": "double quoted",
+        "TAPASS_TEST_SQUOTED": "single quoted",
+        "TAPASS_TEST_HASH_IN_QUOTES": "a # b",
+        "TAPASS_TEST_EXPORTED": "exported",
+    }
+    for key, value in values.items():
+        assert os.environ[key] == value
+
+
+def test_load_env_once_keeps_existing_environment(tmp_path, monkeypatch):
+    path = _write_env(tmp_path, monkeypatch, "TAPASS_TEST_PRESET=from-file\n")
+    monkeypatch.setenv("TAPASS_TEST_PRESET", "from-environment")
+
+    assert load_env_once(path) == {"TAPASS_TEST_PRESET": "from-file"}
+    assert os.environ["TAPASS_TEST_PRESET"] == "from-environment"
+
+
+def test_load_env_once_reads_each_file_once(tmp_path, monkeypatch):
+    path = _write_env(tmp_path, monkeypatch, "TAPASS_TEST_PLAIN=first\n")
+    assert load_env_once(path) == {"TAPASS_TEST_PLAIN": "first"}
+
+    (tmp_path / ".env").write_text("TAPASS_TEST_PLAIN=second\n", encoding="utf-8")
+    assert load_env_once(path) == {"TAPASS_TEST_PLAIN": "first"}
+
+
+def test_save_passes_last_pass_with_a_serial_wins(tmp_path):
+    passes = [{"serialNumber": "TICKET_1", "seat": str(seat)} for seat in range(3)]
+    passes.append({"seat": "unnumbered"})
+
+    FileUtils.save_passes(passes, str(tmp_path))
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["pass_TICKET_1.json", "pass_UNKNOWN_3.json"]
+    assert json.loads((tmp_path / "pass_TICKET_1.json").read_text(encoding="utf-8")) == passes[2]
@@ -5,28 +5,64 @@ Utility functions for file operations and testing.
 import json
 import logging
 import os
-from typing import Dict, List
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from dotenv import dotenv_values
 
 logger = logging.getLogger(__name__)
 
+# Set once the self-tests have passed; they exercise fixed inputs, so one run per process suffices
+_SELFTEST_PASSED: bool = False
+
+
+@lru_cache(maxsize=None)
+def load_env_once(path: str) -> Dict[str, str]:
+    """Load a .env file into os.environ, once per process and path.
+    
+    Parsed by python-dotenv, so quoting, inline comments and ``export``
+    lines behave as with load_dotenv. Variables already set in the
+    environment are left alone. Returns the loaded values; repeat calls
+    reuse them.
+    """
+    # Keys without a value parse as None; load_dotenv skips those too
+    values = {key: value for key, value in dotenv_values(path).items() if value is not None}
+    for key, value in values.items():
+        os.environ.setdefault(key, value)
+    return values
+
+
+@lru_cache(maxsize=4)
+def find_pdf_files(directory: str) -> Tuple[Path, ...]:
+    """PDF files directly inside directory, scanned once per process and directory."""
+    # DirEntry already knows the name and type, so non-PDFs cost neither a Path nor a stat
+    with os.scandir(directory) as it:
+        return tuple(
+            Path(entry.path) for entry in it
+            if entry.name.lower().endswith('.pdf') and not entry.name.startswith('.') and entry.is_file()
+        )
+
 
 class FileUtils:
     """File operation utilities"""
     
     @staticmethod
-    def save_passes(passes: List[Dict], output_dir: str) -> None:
-        """Save passes to individual JSON files"""
+    def save_passes(passes: List[Dict], output_dir: str, pretty: bool = False) -> None:
+        """Save passes to individual JSON files (compact unless pretty is set)"""
         os.makedirs(output_dir, exist_ok=True)
+        if not passes:
+            return
+        # Compact output stays on json's C encoder; indent forces the pure-Python one
+        dump_kwargs = {'indent': 2} if pretty else {'separators': (',', ':')}
         
+        # Written in order, so passes sharing a serial leave the last one on disk
         for i, pass_data in enumerate(passes):
-            serial = pass_data.get('serialNumber', f'UNKNOWN_{i}')
-            filename = f"pass_{serial}.json"
-            filepath = os.path.join(output_dir, filename)
-            
+            filepath = os.path.join(output_dir, f"pass_{pass_data.get('serialNumber') or f'UNKNOWN_{i}'}.json")
             with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(pass_data, f, indent=2, ensure_ascii=False)
-            
-            logger.info(f"Saved pass to: {filepath}")
+                json.dump(pass_data, f, ensure_ascii=False, **dump_kwargs)
+        
+        logger.info("Saved %d pass(es) to: %s", len(passes), output_dir)
 
 
 class TestRunner:
@@ -35,6 +71,10 @@ class TestRunner:
     @staticmethod
     def run_self_tests() -> bool:
         """Run basic self-tests"""
+        global _SELFTEST_PASSED
+        if _SELFTEST_PASSED:
+            return True
+        
         logger.info("Running self-tests...")
         
         from field_parser import FieldParser
@@ -61,4 +101,5 @@ class TestRunner:
         assert serial.startswith("TICKET_"), "Serial should start with TICKET_"
         
         logger.info("Self-tests passed!")
+        _SELFTEST_PASSED = True
         return True